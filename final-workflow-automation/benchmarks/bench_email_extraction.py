@@ -0,0 +1,85 @@
+import argparse
+import random
+import re
+import time
+import unicodedata
+
+from bs4 import BeautifulSoup
+
+from utils.email_extractor import extract_emails_from_dom, find_emails
+
+WORDS = ("advertising media partners contact sales press about team news "
+         "the our with for and that data format category").split()
+
+
+def legacy_extract_emails(text):
+    # The extractor that lived in utils/text_utils.py, kept as the baseline
+    text = unicodedata.normalize("NFKD", text)
+    text = re.sub(r"[^\w\s@\[\]\(\)\.-]+", "", text).strip().lower()
+    obfuscated = re.findall(
+        r"[\w\.-]+\s?\[?at\]?\s?[\w\.-]+\s?(dot|\.)\s?[a-z]{2,}", text
+    )
+    deobfuscated = [
+        re.sub(r"\s?\[?at\]?\s?", "@", re.sub(r"\s?(dot|\.)\s?", ".", m))
+        for m in obfuscated
+    ]
+    standard = re.findall(r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}", text)
+    return [e for e in set(standard + deobfuscated) if e != "."]
+
+
+def make_page(size_chars, seed=7):
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size_chars:
+        roll = rng.random()
+        if roll < 0.002:
+            line = f"Reach us at sales{rng.randint(1, 99)}@example.com today"
+        elif roll < 0.003:
+            line = f"press{rng.randint(1, 99)} [at] example [dot] org"
+        else:
+            line = " ".join(rng.choice(WORDS) for _ in range(12))
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def make_html(text):
+    mailto = '<a href="mailto:ads@example.com?subject=Hi">Email</a>'
+    # "ads@example.com" encoded with key 0x42
+    protected = '<span class="__cf_email__" data-cfemail="4223263102273a232f322e276c212d2f">[email&#160;protected]</span>'
+    return f"<body><p>{text}</p>{mailto}{protected}</body>"
+
+
+def time_call(func, arg, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, repeat):
+    print(f"{'size':>10} {'legacy ms':>10} {'new ms':>10} {'speedup':>8} {'found':>6}")
+    for size in sizes:
+        text = make_page(size)
+        legacy = time_call(legacy_extract_emails, text, repeat)
+        new = time_call(find_emails, text, repeat)
+        found = len(find_emails(text))
+        print(f"{size:>10} {legacy * 1000:>10.2f} {new * 1000:>10.2f} "
+              f"{legacy / new:>7.1f}x {found:>6}")
+
+    soup = BeautifulSoup(make_html("filler"), "html.parser")
+    dom = time_call(extract_emails_from_dom, soup, repeat)
+    print(f"\nDOM harvest: {extract_emails_from_dom(soup)} in {dom * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark for email extraction on large pages")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[50_000, 500_000, 2_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,153 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from config import BASE_DIR
+from extraction.form_extraction import extract_submit_button, parse_form_fields
+from extraction.link_extraction import is_relevant_link, parse_links_from_html
+from form_submit.utils import form_is_fillable, smart_match
+from utils.email_extractor import find_emails
+
+REPO_DIR = BASE_DIR.parent
+HTML_CODES_DIR = REPO_DIR / "auto-form-filler" / "html-codes"
+TEXT_FILES_DIR = REPO_DIR / "other" / "docs" / "text-files"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def load_corpus():
+    html_pages = [path.read_text(encoding="utf-8", errors="ignore")
+                  for path in sorted(HTML_CODES_DIR.glob("*.html"))]
+    text_files = [path.read_text(encoding="utf-8", errors="ignore")
+                  for path in sorted(TEXT_FILES_DIR.glob("*.txt"))]
+    page_texts = [BeautifulSoup(html, "html.parser").get_text(separator="\n")
+                  for html in html_pages]
+    parsed_forms = [parse_form_fields(html) for html in html_pages]
+    labels = [(field.get("aria_label") or field.get("placeholder") or field.get("name")
+               or field.get("id") or field.get("title") or "",
+               field.get("type") or field.get("tag", ""))
+              for fields in parsed_forms for field in fields]
+    link_texts = [text for html in html_pages
+                  for text, _ in parse_links_from_html(html, all_links=True)]
+    return {
+        'html_pages': html_pages,
+        'texts': page_texts + text_files,
+        'parsed_forms': parsed_forms,
+        'labels': labels,
+        'link_texts': link_texts,
+    }
+
+
+def benchmark_cases(corpus):
+    # name -> (function, list of argument tuples); one call per item
+    return {
+        'parse_form_fields': (parse_form_fields, [(h,) for h in corpus['html_pages']]),
+        'extract_submit_button': (extract_submit_button, [(h,) for h in corpus['html_pages']]),
+        'form_is_fillable': (form_is_fillable, [(f,) for f in corpus['parsed_forms']]),
+        'smart_match': (smart_match, corpus['labels']),
+        # The extractor behind extract_emails_from_text, without its two
+        # prints, which would otherwise dominate the timing
+        'find_emails': (find_emails, [(t,) for t in corpus['texts']]),
+        'is_relevant_link': (is_relevant_link, [(t,) for t in corpus['link_texts']]),
+        'parse_links_from_html': (parse_links_from_html, [(h, True) for h in corpus['html_pages']]),
+    }
+
+
+def run_case(func, items, repeat):
+    # Per-call timings over every corpus item, best pass kept per item
+    timings = [float("inf")] * len(items)
+    for _ in range(repeat):
+        for i, args in enumerate(items):
+            start = time.perf_counter()
+            func(*args)
+            timings[i] = min(timings[i], time.perf_counter() - start)
+
+    timings_us = sorted(t * 1_000_000 for t in timings)
+    return {
+        'items': len(items),
+        'total_ms': round(sum(timings_us) / 1000, 3),
+        'mean_us': round(statistics.mean(timings_us), 2),
+        'p50_us': round(timings_us[len(timings_us) // 2], 2),
+        'p95_us': round(timings_us[min(len(timings_us) - 1, int(len(timings_us) * 0.95))], 2),
+        'max_us': round(timings_us[-1], 2),
+    }
+
+
+def git_revision():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--", "."], cwd=BASE_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+        return sha, dirty
+    except Exception:
+        return "unknown", False
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline['git_sha']} ({baseline_path}):")
+    for name, row in results['cases'].items():
+        old = baseline['cases'].get(name)
+        if not old or 'total_ms' not in old or 'total_ms' not in row:
+            continue
+        change = (row['total_ms'] - old['total_ms']) / old['total_ms'] * 100 if old['total_ms'] else 0.0
+        print(f"  {name:<26} {old['total_ms']:>10.2f} ms -> {row['total_ms']:>10.2f} ms ({change:+.1f}%)")
+
+
+def run(repeat=5, only=None, output_dir=RESULTS_DIR, baseline=None):
+    corpus = load_corpus()
+    sha, dirty = git_revision()
+    results = {
+        'git_sha': sha,
+        'dirty': dirty,
+        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'python': platform.python_version(),
+        'repeat': repeat,
+        'corpus': {key: len(value) for key, value in corpus.items()},
+        'cases': {},
+    }
+
+    print(f"{'case':<26} {'items':>6} {'total ms':>10} {'mean us':>10} {'p95 us':>10}")
+    for name, (func, items) in benchmark_cases(corpus).items():
+        if only and name not in only:
+            continue
+        try:
+            row = run_case(func, items, repeat)
+        except Exception as e:
+            # e.g. the spaCy model is not installed
+            results['cases'][name] = {'error': str(e)}
+            print(f"{name:<26} failed: {e}")
+            continue
+        results['cases'][name] = row
+        print(f"{name:<26} {row['items']:>6} {row['total_ms']:>10.2f} "
+              f"{row['mean_us']:>10.2f} {row['p95_us']:>10.2f}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    suffix = "-dirty" if dirty else ""
+    path = output_dir / f"{time.strftime('%Y%m%d-%H%M%S')}_{sha}{suffix}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n[BENCH] Results written to {path}")
+
+    if baseline:
+        compare(results, baseline)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the extraction and matching hot paths on the stored HTML corpus")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="run only these cases")
+    parser.add_argument("--output-dir", default=str(RESULTS_DIR))
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+    run(args.repeat, args.only, args.output_dir, args.compare)
@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import sys
+
+# One entry point for the pipeline:
+#   python cli.py crawl --input domains.txt --workers 4 --run-profile fast-no-gpt
+#   python cli.py fill https://example.com/advertise
+#   python cli.py report --results data/logs/run_x/results.sqlite
+#   python cli.py replay --recordings llm.jsonl --input domains.txt
+#   python cli.py bench --compare benchmarks/results/<earlier>.json
+#
+# config.py reads its settings from the environment at import time, so the
+# flags are turned into environment variables first and the pipeline modules
+# are imported inside each command.
+
+# flag dest -> environment variable read by config.py
+SETTING_FLAGS = {
+    'run_profile': "RUN_PROFILE",
+    'input': "DOMAINS_TXT_PATH",
+    'workers': "DOMAIN_WORKERS",
+    'gpt_workers': "GPT_MAX_WORKERS",
+    'domain_timeout': "DOMAIN_TIMEOUT_S",
+    'crawl_budget': "DOMAIN_CRAWL_BUDGET_S",
+    'cache_path': "DOMAIN_CACHE_PATH",
+    'cache_ttl_days': "DOMAIN_CACHE_TTL_DAYS",
+    'logs_dir': "RUN_LOGS_DIR",
+    'output_csv': "OUTPUT_CSV_PATH",
+    'chromedriver': "CHROMEDRIVER_PATH",
+    'url_scheme': "DOMAIN_URL_SCHEME",
+    'llm_backend': "LLM_BACKEND",
+    'mock_llm_url': "MOCK_LLM_URL",
+    'model': "GPT_MODEL",
+    'form_evaluation': "FORM_EVALUATION_MODE",
+    'form_backend': "FORM_RELEVANCE_BACKEND",
+    'record_llm': "LLM_RECORDINGS_PATH",
+    'captcha_backend': "CAPTCHA_BACKEND",
+    'captcha_timeout': "CAPTCHA_TIMEOUT_S",
+}
+
+
+def apply_settings(args):
+    for dest, env_name in SETTING_FLAGS.items():
+        value = getattr(args, dest, None)
+        if value is not None:
+            os.environ[env_name] = str(value)
+    if getattr(args, 'no_cache', False):
+        os.environ["DOMAIN_CACHE_ENABLED"] = "0"
+
+
+def run_crawl(args):
+    from config import PROFILE_THRESHOLD_S
+    from processing.main import main
+
+    threshold = args.profile_threshold
+    main(profile=args.profile,
+         profile_threshold=PROFILE_THRESHOLD_S if threshold is None else threshold)
+
+
+def run_fill(args):
+    from form_submit.fill_form import fill_and_submit_form
+    from utils.tracing import new_timings
+
+    log = {'timings': new_timings()}
+    fill_and_submit_form(args.url, log)
+    print(json.dumps(log, indent=2, default=str))
+
+
+def run_report(args):
+    from config import OUTPUT_CSV_PATH
+    from utils.report_utils import generate_summary_csv
+    from utils.results_store import iter_results
+    from utils.tracing import write_timing_report
+
+    generate_summary_csv(args.results, args.output_csv or OUTPUT_CSV_PATH)
+    if args.timings:
+        write_timing_report(
+            (result['log'] for result in iter_results(args.results, with_log=True)
+             if not result['cache_hit']),
+            args.timings)
+
+
+def run_replay(args):
+    # A crawl whose LLM answers come from recorded responses: no API key,
+    # no cost, and the same answers for the same prompts
+    from mock_llm.server import start_mock_llm
+
+    server = start_mock_llm(args.port, recordings=args.recordings)
+    os.environ["LLM_BACKEND"] = "mock"
+    os.environ["MOCK_LLM_URL"] = f"http://127.0.0.1:{args.port}/v1"
+    try:
+        run_crawl(args)
+    finally:
+        server.shutdown()
+
+
+def run_bench(args):
+    from benchmarks.run_benchmarks import RESULTS_DIR, run
+
+    run(args.repeat, args.only, args.output_dir or RESULTS_DIR, args.compare)
+
+
+def add_setting_flags(parser):
+    parser.add_argument("--run-profile", help="named settings from config.RUN_PROFILES")
+    parser.add_argument("--logs-dir", help="directory for this run's results, progress and reports")
+    parser.add_argument("--output-csv", help="summary CSV written at the end of the run")
+    parser.add_argument("--chromedriver", help="chromedriver binary for this machine")
+    parser.add_argument("--model", help="OpenAI model for every GPT request")
+    parser.add_argument("--llm-backend", choices=["openai", "mock"])
+    parser.add_argument("--mock-llm-url", help="base URL of python -m mock_llm.server")
+    parser.add_argument("--record-llm", help="append every LLM response to this JSONL for replay")
+    parser.add_argument("--gpt-workers", type=int, help="concurrent GPT requests")
+    parser.add_argument("--captcha-backend", choices=["anticaptcha", "fake", "none"])
+    parser.add_argument("--captcha-timeout", type=float, help="seconds before an Anti-Captcha solve is given up")
+
+
+def add_crawl_flags(parser):
+    parser.add_argument("--input", help="text file with one domain per line")
+    parser.add_argument("--workers", type=int, help="domains crawled at the same time")
+    parser.add_argument("--domain-timeout", type=float, help="hard limit per domain in seconds")
+    parser.add_argument("--crawl-budget", type=float,
+                        help="seconds after which no more subpages of a domain are visited")
+    parser.add_argument("--url-scheme", choices=["https", "http"])
+    parser.add_argument("--cache-path", help="JSONL cache of finished domains")
+    parser.add_argument("--cache-ttl-days", type=float)
+    parser.add_argument("--no-cache", action="store_true", help="crawl every domain again")
+    parser.add_argument("--form-evaluation", choices=["batch", "per_form"])
+    parser.add_argument("--form-backend", choices=["gpt", "model", "local"],
+                        help="who judges forms the cue cascade leaves uncertain")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile each domain with cProfile and a stack sampler")
+    parser.add_argument("--profile-threshold", type=float,
+                        help="only keep profiles of domains slower than this many seconds")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Lead extraction and form submission pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    crawl = commands.add_parser("crawl", help="crawl the input domains")
+    add_setting_flags(crawl)
+    add_crawl_flags(crawl)
+    crawl.set_defaults(handler=run_crawl)
+
+    fill = commands.add_parser("fill", help="fill and submit one form page")
+    add_setting_flags(fill)
+    fill.add_argument("url")
+    fill.set_defaults(handler=run_fill)
+
+    report = commands.add_parser("report", help="rebuild the summary CSV from a results store")
+    report.add_argument("--results", required=True, help="results.sqlite of an earlier run")
+    report.add_argument("--output-csv")
+    report.add_argument("--timings", help="also write the stage timing report here")
+    report.set_defaults(handler=run_report)
+
+    replay = commands.add_parser("replay", help="crawl with recorded LLM responses via the mock server")
+    add_setting_flags(replay)
+    add_crawl_flags(replay)
+    replay.add_argument("--recordings", required=True, help="JSONL written by --record-llm")
+    replay.add_argument("--port", type=int, default=8900)
+    replay.set_defaults(handler=run_replay)
+
+    bench = commands.add_parser("bench", help="run the offline benchmark suite")
+    bench.add_argument("--repeat", type=int, default=5)
+    bench.add_argument("--only", nargs="+", help="run only these cases")
+    bench.add_argument("--output-dir")
+    bench.add_argument("--compare", help="earlier results file to compare against")
+    bench.set_defaults(handler=run_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    apply_settings(args)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,16 @@
 from datetime import datetime
 import os
 import warnings
-import spacy
-from openai import OpenAI
 from dotenv import load_dotenv
 from pathlib import Path
 
+# Settings only: importing this module must stay cheap and side-effect free.
+# spaCy, API clients and the run log directory are created on first use by
+# resources.py.
+
+# === Load .env variables ===
+load_dotenv()
+
 PREDEFINED_FIELDS = {
     "email": "abc123@gmail.com",
     "first_name": "John",
@@ -24,28 +29,115 @@ ANTI_CAPTCHA_KEY = os.getenv("ANTI_CAPTCHA_KEY")
 # === Suppress warnings globally ===
 warnings.filterwarnings("ignore")
 
-# === Load .env variables ===
-load_dotenv()
+SPACY_MODEL = "en_core_web_sm"
 
-# === Load spaCy model ===
-nlp = spacy.load("en_core_web_sm")
+# === Run profiles ===
+# Named sets of settings, picked with RUN_PROFILE (or `cli.py --run-profile`).
+# Environment variables still win over the profile, the profile over the
+# defaults below.
+RUN_PROFILES = {
+    # Cue cascade only: forms it cannot settle are skipped instead of sent to GPT
+    "fast-no-gpt": {
+        "FORM_EVALUATION_MODE": "batch",
+        "FORM_RELEVANCE_BACKEND": "local",
+        "DOMAIN_WORKERS": 4,
+        "DOMAIN_TIMEOUT_S": 120,
+        "DOMAIN_CRAWL_BUDGET_S": 90,
+    },
+    # Every form judged by GPT, full page text, more time per domain
+    "thorough": {
+        "FORM_EVALUATION_MODE": "per_form",
+        "FORM_CASCADE_ENABLED": 0,
+        "TEXT_COMPACTION_ENABLED": 0,
+        "DOMAIN_TIMEOUT_S": 600,
+        "DOMAIN_CRAWL_BUDGET_S": 480,
+    },
+}
+RUN_PROFILE = os.getenv("RUN_PROFILE", "")
+if RUN_PROFILE and RUN_PROFILE not in RUN_PROFILES:
+    raise ValueError(f"Unknown RUN_PROFILE: {RUN_PROFILE}")
+
+
+def _setting(name, default, cast=str):
+    value = os.getenv(name)
+    if value is None or value == "":
+        value = RUN_PROFILES.get(RUN_PROFILE, {}).get(name, default)
+    return cast(value)
+
+
+def _flag(value):
+    return str(value).lower() not in ("0", "false", "no", "off")
 
 # === Base Paths ===
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 BIN_DIR = BASE_DIR / "bin"
 
-OUTPUT_CSV_PATH = DATA_DIR / "output" / "final_summary.csv"
+# Paths can be overridden from the environment (used by the load test harness)
+OUTPUT_CSV_PATH = Path(os.getenv("OUTPUT_CSV_PATH")
+                       or DATA_DIR / "output" / "final_summary.csv")
 
 # === File paths ===
-CHROMEDRIVER_PATH = BIN_DIR / "chromedriver-win64" / "chromedriver.exe"
-DOMAINS_TXT_PATH = DATA_DIR / "input" / "domains.txt"
+CHROMEDRIVER_PATH = Path(os.getenv("CHROMEDRIVER_PATH")
+                         or (BIN_DIR / "chromedriver-win64" / "chromedriver.exe" if os.name == "nt"
+                             else BIN_DIR / "chromedriver-linux64" / "chromedriver"))
+DOMAINS_TXT_PATH = Path(os.getenv("DOMAINS_TXT_PATH")
+                        or DATA_DIR / "input" / "domains.txt")
+DOMAIN_URL_SCHEME = os.getenv("DOMAIN_URL_SCHEME", "https")
+
+# === Crawl limits ===
+DOMAIN_WORKERS = _setting("DOMAIN_WORKERS", 1, int)  # domains crawled at the same time
+DOMAIN_TIMEOUT_S = _setting("DOMAIN_TIMEOUT_S", 300, float)  # hard limit per domain
+DOMAIN_CRAWL_BUDGET_S = _setting("DOMAIN_CRAWL_BUDGET_S", 240, float)  # stop visiting subpages after this
+
+# === Browser watchdog ===
+# Chrome trees above the cap are killed; the domain then fails like a crash
+BROWSER_RSS_CAP_MB = _setting("BROWSER_RSS_CAP_MB", 1500, float)  # 0 disables the cap
+BROWSER_WATCHDOG_INTERVAL_S = 5
+
+# === Captcha solving ===
+# Solves run in the background while the form is filled
+# "anticaptcha", "fake" (local stand-in, no cost) or "none" (never solve)
+CAPTCHA_BACKEND = _setting("CAPTCHA_BACKEND", "anticaptcha")
+# Per backend: solves at the same time, seconds before giving up, and
+# USD per solved captcha by widget kind
+CAPTCHA_BACKEND_SETTINGS = {
+    "anticaptcha": {
+        "max_concurrency": 4,
+        "timeout_s": _setting("CAPTCHA_TIMEOUT_S", 90, float),
+        "prices": {"recaptcha": 0.002, "hcaptcha": 0.002, "turnstile": 0.002},
+    },
+    "fake": {
+        "max_concurrency": 8,
+        "timeout_s": 30,
+        "prices": {"recaptcha": 0.0, "hcaptcha": 0.0, "turnstile": 0.0},
+    },
+    "none": {"max_concurrency": 8, "timeout_s": 0, "prices": {}},
+}
+CAPTCHA_FAKE_DELAY_S = _setting("CAPTCHA_FAKE_DELAY_S", 2.0, float)
+CAPTCHA_POLL_INTERVAL_S = 3
+CAPTCHA_MAX_WORKERS = 8  # solver threads shared by all backends
+CAPTCHA_MAX_FAILURES = 3  # consecutive failures before a backend cools down
+CAPTCHA_COOLDOWN_S = 300
+
+# Results of finished domains, reused by later runs while fresh
+DOMAIN_CACHE_ENABLED = _setting("DOMAIN_CACHE_ENABLED", 1, _flag)
+DOMAIN_CACHE_PATH = Path(os.getenv("DOMAIN_CACHE_PATH")
+                         or DATA_DIR / "cache" / "domain_results.jsonl")
+DOMAIN_CACHE_TTL_DAYS = _setting("DOMAIN_CACHE_TTL_DAYS", 30, float)
 
 # Logs creation
 LOGS_PARENT_DIR = DATA_DIR / "logs"
 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-LOGS_DIR_PATH = LOGS_PARENT_DIR / f"run_{timestamp}"
-os.makedirs(LOGS_DIR_PATH, exist_ok=True)
+LOGS_DIR_PATH = Path(os.getenv("RUN_LOGS_DIR")
+                     or LOGS_PARENT_DIR / f"run_{timestamp}")  # created by resources.get_logs_dir()
+# Every finished domain is appended here; reports stream from it
+RESULTS_DB_PATH = LOGS_DIR_PATH / "results.sqlite"
+
+# --profile: per-domain cProfile dumps and collapsed stacks
+PROFILES_DIR_PATH = LOGS_DIR_PATH / "profiles"
+PROFILE_THRESHOLD_S = 0.0  # only keep profiles of domains slower than this
+PROFILE_SAMPLE_INTERVAL_S = 0.01
 
 # === Keyword logic ===
 INTENT_KEYWORDS = ["contact", "advertise", "ad",
@@ -53,13 +145,52 @@ INTENT_KEYWORDS = ["contact", "advertise", "ad",
 EXCLUSION_PHRASES = ["terms of sale", "terms", "policy",
                      "markets", "media & entertainment", "media-entertainment"]
 
+# === Page text compaction ===
+# Script/style text is always dropped; nav, header, footer and sidebar blocks
+# are kept the first time they appear on a domain and dropped on later pages.
+TEXT_COMPACTION_ENABLED = _setting("TEXT_COMPACTION_ENABLED", 1, _flag)
+
 # === GPT Token config ===
+GPT_MODEL = _setting("GPT_MODEL", "gpt-4o-mini")
 GPT_MAX_TOKENS = 16000
 SAFETY_BUFFER_TOKENS = 1000
 AVAILABLE_TEXT_TOKENS = GPT_MAX_TOKENS - SAFETY_BUFFER_TOKENS
-GPT_COST_PER_1K_TOKENS = 0.005
-GPT_COST_PER_TOKEN = GPT_COST_PER_1K_TOKENS / 1000  # $0.000005 per token
+SUMMARY_INPUT_TOKENS = 4000  # page text sent per summarize call, also the chunk size for long pages
+
+# "batch": judge all candidate forms of a domain in one request
+# "per_form": judge each form with its own request, dispatched while crawling
+FORM_EVALUATION_MODE = _setting("FORM_EVALUATION_MODE", "batch")
+FORM_SCHEMA_MAX_TOKENS = 400  # cap for the compact form description sent to GPT
+FORM_NEARBY_TEXT_CHARS = 600
+
+# Local cue scoring settles clear cases; only the band in between goes to GPT
+FORM_CASCADE_ENABLED = _setting("FORM_CASCADE_ENABLED", 1, _flag)
+FORM_CASCADE_ACCEPT_SCORE = 4.0
+FORM_CASCADE_REJECT_SCORE = -3.0
+
+# "gpt" or "model": who judges the forms the cascade leaves uncertain.
+# The model is trained with `python -m training.train_form_model`.
+# "local" skips uncertain forms, so no GPT request judges a form.
+FORM_RELEVANCE_BACKEND = _setting("FORM_RELEVANCE_BACKEND", "gpt")
+FORM_MODEL_PATH = DATA_DIR / "models" / "form_relevance.json"
+FORM_MODEL_THRESHOLD = 0.5
+GPT_MAX_WORKERS = _setting("GPT_MAX_WORKERS", 8, int)  # concurrent GPT requests
+
+# === GPT pricing (USD per 1M tokens) ===
+GPT_MODEL_PRICES = {
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "output": 10.00},
+    "gpt-4.1": {"input": 2.00, "output": 8.00},
+    "gpt-4.1-mini": {"input": 0.40, "output": 1.60},
+    "gpt-4.1-nano": {"input": 0.10, "output": 0.40},
+    "mock": {"input": 0.0, "output": 0.0},  # answers from mock_llm.server
+}
 
 # === OpenAI setup ===
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
+
+# "openai" or "mock" (python -m mock_llm.server) for free, deterministic runs
+LLM_BACKEND = _setting("LLM_BACKEND", "openai")
+MOCK_LLM_URL = os.getenv("MOCK_LLM_URL", "http://127.0.0.1:8900/v1")
+# When set, every response is appended here so the mock server can replay it
+LLM_RECORDINGS_PATH = os.getenv("LLM_RECORDINGS_PATH")
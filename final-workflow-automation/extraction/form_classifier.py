@@ -0,0 +1,119 @@
+import re
+import threading
+
+from config import FORM_CASCADE_ENABLED, FORM_CASCADE_ACCEPT_SCORE, FORM_CASCADE_REJECT_SCORE
+
+# Cue phrases and their weight, matched on word boundaries against the
+# compact form description. Positive cues point at advertising forms,
+# negative ones at forms we never want to fill.
+FORM_CUES = {
+    "advertise with us": 4.0,
+    "advertising inquiry": 4.0,
+    "advertising enquiry": 4.0,
+    "media kit": 4.0,
+    "rate card": 3.5,
+    "sponsorship": 3.0,
+    "sponsored content": 3.0,
+    "sponsored post": 3.0,
+    "advertise": 2.5,
+    "advertising": 2.5,
+    "advertiser": 2.5,
+    "marketing inquiry": 3.0,
+    "promote your": 2.0,
+    "ad placement": 3.0,
+    "partnership": 1.5,
+    "partnerships": 1.5,
+    "media buying": 3.0,
+    "campaign": 1.0,
+    "budget": 1.0,
+    "newsletter": -3.0,
+    "subscribe": -2.5,
+    "unsubscribe": -4.0,
+    "sign up": -1.5,
+    "log in": -4.0,
+    "login": -4.0,
+    "sign in": -4.0,
+    "password": -4.0,
+    "forgot password": -4.0,
+    "leave a reply": -4.0,
+    "leave a comment": -4.0,
+    "post comment": -4.0,
+    "your comment": -3.0,
+    "careers": -3.0,
+    "job application": -4.0,
+    "apply now": -3.0,
+    "resume": -3.0,
+    "cover letter": -3.5,
+    "order number": -3.0,
+    "track your order": -4.0,
+}
+URL_CUES = {
+    "advertis": 2.5,
+    "media-kit": 2.5,
+    "mediakit": 2.5,
+    "sponsor": 2.0,
+    "partner": 1.0,
+    "login": -3.0,
+    "careers": -3.0,
+    "jobs": -2.0,
+    "newsletter": -2.0,
+}
+
+_CUE_PATTERNS = [
+    (cue, weight, re.compile(r"\b" + re.escape(cue) + r"\b"))
+    for cue, weight in FORM_CUES.items()
+]
+
+_lock = threading.Lock()
+
+
+def score_form_locally(form_schema, page_url=""):
+    text = form_schema.lower()
+    url = page_url.lower()
+    score = 0.0
+    cues = []
+
+    for cue, weight, pattern in _CUE_PATTERNS:
+        if pattern.search(text):
+            score += weight
+            cues.append(cue)
+
+    for cue, weight in URL_CUES.items():
+        if cue in url:
+            score += weight
+            cues.append(f"url:{cue}")
+
+    return round(score, 2), cues
+
+
+def classify_form_locally(form_schema, page_url, log):
+    score, cues = score_form_locally(form_schema, page_url)
+
+    if not FORM_CASCADE_ENABLED:
+        decision = "uncertain"
+    elif score >= FORM_CASCADE_ACCEPT_SCORE:
+        decision = "accept"
+    elif score <= FORM_CASCADE_REJECT_SCORE:
+        decision = "reject"
+    else:
+        decision = "uncertain"
+
+    with _lock:
+        cascade = log.setdefault('form_cascade', {
+            'accepted': 0,
+            'rejected': 0,
+            'uncertain': 0,
+            'decisions': []
+        })
+        key = {'accept': 'accepted', 'reject': 'rejected'}.get(
+            decision, 'uncertain')
+        cascade[key] += 1
+        cascade['decisions'].append({
+            'url': page_url,
+            'score': score,
+            'decision': decision,
+            'cues': cues,
+        })
+
+    print(f"[CASCADE] {decision.upper()} (score {score}) {page_url} {cues}")
+    return decision, score
@@ -0,0 +1,104 @@
+import re
+
+from utils.token_utils import truncate_to_tokens
+from config import FORM_SCHEMA_MAX_TOKENS, FORM_NEARBY_TEXT_CHARS
+
+SKIPPED_FIELD_TYPES = {"hidden", "submit", "button", "image", "reset"}
+NOISE_TAGS = ["script", "style", "noscript", "svg", "iframe", "template"]
+MAX_SELECT_OPTIONS = 6
+
+
+def _clean(text):
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def _field_line(field, form):
+    label = _clean(field["label"]) or field["name"]
+    details = [field["type"]]
+    if field["required"]:
+        details.append("required")
+
+    if field["tag"] == "select" and field["name"]:
+        select = form.find("select", attrs={"name": field["name"]}) or \
+            form.find("select", attrs={"id": field["id"]})
+        if select:
+            options = [_clean(o.get_text()) for o in select.find_all("option")]
+            options = [o for o in options if o][:MAX_SELECT_OPTIONS]
+            if options:
+                details.append("options: " + " / ".join(options))
+
+    return f"- {label} ({', '.join(details)})"
+
+
+def _headings_before(form, limit=3):
+    headings = []
+    for tag in form.find_all_previous(["h1", "h2", "h3", "h4", "legend"], limit=limit):
+        text = _clean(tag.get_text(" "))
+        if text and text not in headings:
+            headings.append(text)
+    return list(reversed(headings))
+
+
+def _nearby_text(form):
+    # Text around the form from the closest ancestor that has any,
+    # without the form's own field labels and capped in length.
+    form_text = _clean(form.get_text(" "))
+    parent = form.parent
+    for _ in range(3):
+        if parent is None:
+            break
+        text = _clean(parent.get_text(" "))
+        if form_text:
+            text = _clean(text.replace(form_text, " "))
+        if text:
+            return text[:FORM_NEARBY_TEXT_CHARS]
+        parent = parent.parent
+    return ""
+
+
+def _submit_text(form):
+    for tag in form.find_all(["button", "input"]):
+        tag_type = (tag.get("type") or "submit").lower()
+        if tag.name == "button" and tag_type == "submit":
+            return _clean(tag.get_text(" ")) or tag.get("value", "")
+        if tag.name == "input" and tag_type in ("submit", "image"):
+            return tag.get("value") or tag.get("alt") or ""
+    return ""
+
+
+def compact_form(form, soup, parsed_fields, max_tokens=FORM_SCHEMA_MAX_TOKENS):
+    for tag in form.find_all(NOISE_TAGS):
+        tag.decompose()
+
+    lines = []
+
+    title_tag = soup.find("title")
+    if title_tag and title_tag.text.strip():
+        lines.append(f"Page Title: {_clean(title_tag.text)}")
+
+    headings = _headings_before(form)
+    if headings:
+        lines.append("Headings: " + " | ".join(headings))
+
+    for attr in ("name", "id", "aria-label"):
+        if form.get(attr):
+            lines.append(f"Form {attr}: {form.get(attr)}")
+            break
+
+    lines.append("Fields:")
+    for field in parsed_fields:
+        if field["type"] in SKIPPED_FIELD_TYPES:
+            continue
+        if "display:none" in (field.get("style") or "").replace(" ", "").lower():
+            continue
+        lines.append(_field_line(field, form))
+
+    submit = _clean(_submit_text(form))
+    if submit:
+        lines.append(f"Submit: {submit}")
+
+    nearby = _nearby_text(form)
+    if nearby:
+        lines.append(f"Nearby Text: {nearby}")
+
+    return truncate_to_tokens("\n".join(lines), max_tokens)
@@ -1,5 +1,5 @@
 from bs4 import BeautifulSoup, Tag
-from gpt.evaluators import evaluate_form_relevance_with_gpt
+from extraction.form_compactor import compact_form
 
 
 def extract_form_details_from_driver(driver, page_num, page_url, log):
@@ -33,34 +33,12 @@ def extract_form_details_from_driver(driver, page_num, page_url, log):
                 continue
 
             form_html = str(form)
-            important_text = []
-
-            title_tag = soup.find("title")
-            if title_tag and title_tag.text.strip():
-                important_text.append(f"Page Title: {title_tag.text.strip()}")
-
-            parent = form.parent
-            for _ in range(3):
-                if not parent:
-                    break
-                nearby_text = parent.get_text(separator=" ", strip=True)
-                if nearby_text:
-                    important_text.append(nearby_text)
-                parent = parent.parent
-
-            form_text = form.get_text(separator=" ", strip=True)
-            if form_text:
-                important_text.append(f"Form Content: {form_text}")
-
-            final_text = "\n".join(important_text)
-
-            is_relevant = evaluate_form_relevance_with_gpt(
-                form_html, final_text, log)
-            if is_relevant:
-                result[page_num + idx] = [form_html, final_text, page_url]
-                print(f"[RELEVANT FORM] Saved form {idx+1} from {page_url}")
-            else:
-                print(f"[SKIPPED] Form {idx+1} not relevant. URL: {page_url}")
+            form_schema = compact_form(
+                form, soup, parse_form_fields(form_html))
+
+            # Relevance is judged by the caller, off the crawling thread
+            result[page_num + idx] = [form_html, form_schema, page_url]
+            print(f"[CANDIDATE FORM] Saved form {idx+1} from {page_url}")
     except Exception as e:
         print(f"[ERROR] Form detection failed: {e}")
     return result
@@ -0,0 +1,79 @@
+import json
+import math
+import re
+import threading
+
+from config import FORM_MODEL_PATH, FORM_MODEL_THRESHOLD
+
+# Same tokenization as scikit-learn's TfidfVectorizer defaults, so the
+# exported weights score identically without scikit-learn installed.
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+_model = None
+_model_loaded = False
+_lock = threading.Lock()
+
+
+def load_form_model(path=FORM_MODEL_PATH):
+    global _model, _model_loaded
+    with _lock:
+        if _model_loaded:
+            return _model
+        _model_loaded = True
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                _model = json.load(f)
+            print(f"[MODEL] Loaded form relevance model from {path}")
+        except FileNotFoundError:
+            print(f"[WARN] No form relevance model at {path}")
+        except Exception as e:
+            print(f"[WARN] Failed to load form relevance model: {e}")
+        return _model
+
+
+def featurize(text, model):
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    min_n, max_n = model["ngram_range"]
+    vocabulary = model["vocabulary"]
+
+    counts = {}
+    for n in range(min_n, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            index = vocabulary.get(" ".join(tokens[i:i + n]))
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+    idf = model["idf"]
+    features = {}
+    for index, count in counts.items():
+        tf = 1 + math.log(count) if model["sublinear_tf"] else count
+        features[index] = tf * idf[index]
+
+    norm = math.sqrt(sum(v * v for v in features.values()))
+    if norm:
+        features = {k: v / norm for k, v in features.items()}
+    return features
+
+
+def predict_form_relevance(form_schema, model=None):
+    model = model or load_form_model()
+    if model is None:
+        return None
+
+    coef = model["coef"]
+    features = featurize(form_schema, model)
+    z = model["intercept"] + sum(coef[i] * v for i, v in features.items())
+    return 1 / (1 + math.exp(-z))
+
+
+def is_form_relevant_by_model(form_schema, page_url, log):
+    probability = predict_form_relevance(form_schema)
+    if probability is None:
+        return None
+
+    log.setdefault('form_model', []).append({
+        'url': page_url,
+        'probability': round(probability, 4),
+    })
+    print(f"[MODEL] Relevance {probability:.2f} for {page_url}")
+    return probability >= FORM_MODEL_THRESHOLD
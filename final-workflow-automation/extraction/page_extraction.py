@@ -4,15 +4,27 @@ from urllib.parse import urljoin
 from extraction.form_extraction import extract_form_details_from_driver
 from extraction.link_extraction import extract_links
 from utils.browser_utils import scroll_to_bottom
+from utils.email_extractor import extract_emails_from_dom
+from utils.text_compaction import compact_soup_text
 from utils.text_utils import extract_emails_from_text
+from config import TEXT_COMPACTION_ENABLED
 
 
-def extract_text_from_page(driver, page_num, page_url, log):
+def extract_text_from_page(driver, page_num, page_url, log, compaction=None):
     try:
         body = driver.find_element(By.TAG_NAME, "body")
         html = body.get_attribute("innerHTML")
         soup = BeautifulSoup(html, "html.parser")
-        text = soup.get_text(separator="\n")
+        # mailto links and Cloudflare-protected addresses never show up
+        # in the visible text, so read them before compaction
+        dom_emails = extract_emails_from_dom(soup)
+        if TEXT_COMPACTION_ENABLED:
+            text = compact_soup_text(soup, compaction)
+        else:
+            text = soup.get_text(separator="\n")
+        missing = [email for email in dom_emails if email not in text.lower()]
+        if missing:
+            text += "\n" + "\n".join(missing)
         form_dict = extract_form_details_from_driver(
             driver, page_num, page_url, log)
         return text, form_dict
@@ -20,7 +32,7 @@ def extract_text_from_page(driver, page_num, page_url, log):
         return "", {}
 
 
-def nested_subpage_recovery(driver, domain_url, log):
+def nested_subpage_recovery(driver, domain_url, log, compaction=None):
     print("\nPerforming nested subpage recovery")
     log["used_recovery"] = True
 
@@ -41,7 +53,7 @@ def nested_subpage_recovery(driver, domain_url, log):
             driver.get(page_url)
             scroll_to_bottom(driver)
             text, extracted_forms = extract_text_from_page(
-                driver, i + 1, page_url, log)
+                driver, i + 1, page_url, log, compaction)
             if not text.strip():
                 continue
             emails = extract_emails_from_text(text)
@@ -0,0 +1,195 @@
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from config import (CAPTCHA_BACKEND, CAPTCHA_COOLDOWN_S, CAPTCHA_MAX_FAILURES, CAPTCHA_MAX_WORKERS,
+                    CAPTCHA_POLL_INTERVAL_S)
+from form_submit.captcha_backends import get_captcha_backend
+
+# Captchas are solved in the background: a solve starts as soon as a sitekey
+# is known (from the stored form HTML, before Chrome is even started), the
+# fields are filled meanwhile, and the token is only waited for right before
+# submit. A form then takes about max(fill, solve) instead of fill + solve.
+
+# kind -> widget class carrying data-sitekey
+CAPTCHA_WIDGETS = {
+    'recaptcha': "g-recaptcha",
+    'hcaptcha': "h-captcha",
+    'turnstile': "cf-turnstile",
+}
+# kind -> fields the widget reads its token from on submit
+CAPTCHA_RESPONSE_FIELDS = {
+    'recaptcha': "textarea[name='g-recaptcha-response'], #g-recaptcha-response",
+    'hcaptcha': "textarea[name='h-captcha-response'], textarea[name='g-recaptcha-response']",
+    'turnstile': "input[name='cf-turnstile-response']",
+}
+WIDGET_PATTERN = re.compile(
+    r"""<[^>]*class=["'][^"']*\b(g-recaptcha|h-captcha|cf-turnstile)\b[^>]*>""", re.I)
+SITEKEY_ATTRIBUTE = re.compile(r"""data-sitekey=["']([^"']+)["']""", re.I)
+WIDGET_KINDS = {widget: kind for kind, widget in CAPTCHA_WIDGETS.items()}
+
+_executor = None
+_lock = threading.Lock()
+# Consecutive failures per backend; past CAPTCHA_MAX_FAILURES the backend is
+# skipped for CAPTCHA_COOLDOWN_S instead of stalling every form on it
+_health = {}
+_ledger = {
+    'started_at': datetime.now().isoformat(timespec="seconds"),
+    'totals': {},
+    'by_backend': {},
+    'by_kind': {},
+}
+
+
+def get_captcha_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=CAPTCHA_MAX_WORKERS, thread_name_prefix="captcha")
+        return _executor
+
+
+def find_captcha(html):
+    # (kind, sitekey) of the first captcha widget in the HTML, or None
+    if not html:
+        return None
+    for match in WIDGET_PATTERN.finditer(html):
+        sitekey = SITEKEY_ATTRIBUTE.search(match.group(0))
+        if sitekey:
+            return WIDGET_KINDS[match.group(1).lower()], sitekey.group(1)
+    return None
+
+
+def find_captcha_in_page(driver):
+    from selenium.webdriver.common.by import By
+
+    for kind, widget in CAPTCHA_WIDGETS.items():
+        for element in driver.find_elements(By.CLASS_NAME, widget):
+            sitekey = element.get_attribute("data-sitekey")
+            if sitekey:
+                return kind, sitekey
+    return None
+
+
+def _empty_rollup():
+    return {'solves': 0, 'solved': 0, 'failed': 0, 'solve_s': 0.0, 'cost_usd': 0.0}
+
+
+def _record_solve(solve):
+    with _lock:
+        for rollup in (_ledger['totals'].setdefault('all', _empty_rollup()),
+                       _ledger['by_backend'].setdefault(solve['backend'], _empty_rollup()),
+                       _ledger['by_kind'].setdefault(solve['kind'], _empty_rollup())):
+            rollup['solves'] += 1
+            rollup['solved' if solve['token'] else 'failed'] += 1
+            rollup['solve_s'] = round(rollup['solve_s'] + solve['solve_s'], 2)
+            rollup['cost_usd'] = round(rollup['cost_usd'] + solve['cost_usd'], 6)
+
+        if not solve['attempted'] or solve['backend'] == "none":
+            return
+        health = _health.setdefault(solve['backend'], {'failures': 0, 'disabled_until': 0.0})
+        if solve['token']:
+            health['failures'] = 0
+        elif not solve['cancelled'].is_set():
+            health['failures'] += 1
+            if health['failures'] >= CAPTCHA_MAX_FAILURES:
+                health['disabled_until'] = time.time() + CAPTCHA_COOLDOWN_S
+                print(f"[CAPTCHA] {solve['backend']} failed {health['failures']} times in a row — "
+                      f"skipping it for {CAPTCHA_COOLDOWN_S}s")
+
+
+def _backend_available(name):
+    with _lock:
+        health = _health.get(name)
+        return not health or time.time() >= health['disabled_until']
+
+
+def _run_solve(solve, backend):
+    try:
+        if not _backend_available(backend['name']):
+            raise Exception(f"{backend['name']} backend is cooling down after repeated failures")
+        # Waiting for a free slot counts against the solve's timeout
+        slot_wait = solve['started_at'] + solve['timeout_s'] - time.time()
+        if not backend['semaphore'].acquire(timeout=max(0.0, slot_wait)):
+            raise Exception(f"No free {backend['name']} slot within {solve['timeout_s']}s")
+        try:
+            solve['attempted'] = True
+            remaining = solve['started_at'] + solve['timeout_s'] - time.time()
+            solve['token'] = backend['solve'](
+                solve['kind'], solve['url'], solve['sitekey'], solve['cancelled'], max(0.0, remaining))
+            solve['cost_usd'] = backend['prices'].get(solve['kind'], 0.0)
+        finally:
+            backend['semaphore'].release()
+    except Exception as e:
+        solve['error'] = str(e)
+    solve['solve_s'] = round(time.time() - solve['started_at'], 2)
+    _record_solve(solve)
+    return solve['token']
+
+
+def start_captcha_solve(url, captcha, backend_name=CAPTCHA_BACKEND):
+    kind, sitekey = captcha
+    backend = get_captcha_backend(backend_name)
+    solve = {
+        'kind': kind,
+        'url': url,
+        'sitekey': sitekey,
+        'backend': backend['name'],
+        'timeout_s': backend['timeout_s'],
+        'started_at': time.time(),
+        'cancelled': threading.Event(),
+        'attempted': False,
+        'token': None,
+        'error': "",
+        'solve_s': None,
+        'cost_usd': 0.0,
+    }
+    print(f"🤖 Solving {kind} via {backend['name']} in the background...")
+    solve['future'] = get_captcha_executor().submit(_run_solve, solve, backend)
+    return solve
+
+
+def cancel_captcha_solve(solve):
+    if solve:
+        solve['cancelled'].set()
+
+
+def wait_captcha_token(solve):
+    # Blocks only for what is left of the solve's own timeout
+    remaining = solve['started_at'] + solve['timeout_s'] + CAPTCHA_POLL_INTERVAL_S - time.time()
+    try:
+        return solve['future'].result(timeout=max(0.0, remaining))
+    except Exception:
+        cancel_captcha_solve(solve)
+        solve['error'] = solve['error'] or "CAPTCHA solving timed out"
+        return None
+
+
+def inject_captcha_token(driver, kind, token):
+    driver.execute_script("""
+        var token = arguments[1];
+        document.querySelectorAll(arguments[0]).forEach(function (field) {
+            field.style.display = "block";
+            field.value = token;
+        });
+    """, CAPTCHA_RESPONSE_FIELDS[kind], token)
+
+
+def get_captcha_ledger():
+    with _lock:
+        return json.loads(json.dumps(_ledger))
+
+
+def write_captcha_ledger(path):
+    ledger = get_captcha_ledger()
+    ledger['finished_at'] = datetime.now().isoformat(timespec="seconds")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(ledger, f, indent=2)
+
+    totals = ledger['totals'].get('all', _empty_rollup())
+    print(f"Captcha ledger: {totals['solved']}/{totals['solves']} solved, "
+          f"${totals['cost_usd']:.4f} — written to {path}")
@@ -0,0 +1,92 @@
+import hashlib
+import threading
+import time
+
+from config import ANTI_CAPTCHA_KEY, CAPTCHA_BACKEND_SETTINGS, CAPTCHA_FAKE_DELAY_S, CAPTCHA_POLL_INTERVAL_S
+
+# A backend is solve(kind, url, sitekey, cancelled, timeout_s) -> token.
+# It raises on failure and should return early once `cancelled` is set.
+# Concurrency limits, timeouts and prices live in CAPTCHA_BACKEND_SETTINGS.
+
+ANTICAPTCHA_TASKS = {
+    # kind -> (task type, solution field)
+    'recaptcha': ("RecaptchaV2TaskProxyless", "gRecaptchaResponse"),
+    'hcaptcha': ("HCaptchaTaskProxyless", "gRecaptchaResponse"),
+    'turnstile': ("TurnstileTaskProxyless", "token"),
+}
+
+
+def solve_with_anticaptcha(kind, url, sitekey, cancelled, timeout_s):
+    from anticaptchaofficial.antinetworking import antiNetworking
+
+    if not ANTI_CAPTCHA_KEY:
+        raise Exception("ANTI_CAPTCHA_KEY is not set")
+    task_type, solution_field = ANTICAPTCHA_TASKS[kind]
+    client = antiNetworking()
+    client.set_key(ANTI_CAPTCHA_KEY)
+    task = {
+        "type": task_type,
+        "websiteURL": url,
+        "websiteKey": sitekey,
+    }
+    if client.create_task({"clientKey": ANTI_CAPTCHA_KEY, "task": task}) != 1:
+        raise Exception(f"Failed to create task: {client.err_string or client.error_code}")
+    print(f"🔁 Captcha task {client.task_id} ({kind}) created for {url}")
+
+    deadline = time.time() + timeout_s
+    # One getTaskResult request per poll; the wait between polls can be cut
+    # short by cancel_captcha_solve()
+    while not cancelled.wait(CAPTCHA_POLL_INTERVAL_S):
+        result = client.make_request("getTaskResult", {
+            "clientKey": ANTI_CAPTCHA_KEY,
+            "taskId": client.task_id,
+        })
+        if result == 0:
+            raise Exception(f"getTaskResult failed: {client.err_string}")
+        if result.get("errorId"):
+            raise Exception(f"API error {result.get('errorCode')}: {result.get('errorDescription')}")
+        if result.get("status") == "ready":
+            return result["solution"][solution_field]
+        if time.time() > deadline:
+            raise Exception("CAPTCHA solving timed out")
+    raise Exception("CAPTCHA solve cancelled")
+
+
+def solve_with_fake(kind, url, sitekey, cancelled, timeout_s):
+    # Local stand-in for tests, benchmarks and load tests: answers after a
+    # fixed delay with a token derived from the sitekey
+    if cancelled.wait(min(CAPTCHA_FAKE_DELAY_S, timeout_s)):
+        raise Exception("CAPTCHA solve cancelled")
+    if CAPTCHA_FAKE_DELAY_S > timeout_s:
+        raise Exception("CAPTCHA solving timed out")
+    return f"fake-{kind}-{hashlib.sha256(sitekey.encode('utf-8')).hexdigest()[:32]}"
+
+
+def solve_with_none(kind, url, sitekey, cancelled, timeout_s):
+    raise Exception("Captcha solving disabled")
+
+
+CAPTCHA_SOLVERS = {
+    'anticaptcha': solve_with_anticaptcha,
+    'fake': solve_with_fake,
+    'none': solve_with_none,
+}
+
+_semaphores = {}
+_lock = threading.Lock()
+
+
+def get_captcha_backend(name):
+    if name not in CAPTCHA_SOLVERS:
+        raise ValueError(f"Unknown CAPTCHA_BACKEND: {name}")
+    settings = CAPTCHA_BACKEND_SETTINGS.get(name, {})
+    with _lock:
+        if name not in _semaphores:
+            _semaphores[name] = threading.BoundedSemaphore(settings.get('max_concurrency', 1))
+    return {
+        'name': name,
+        'solve': CAPTCHA_SOLVERS[name],
+        'semaphore': _semaphores[name],
+        'timeout_s': settings.get('timeout_s', 90),
+        'prices': settings.get('prices', {}),
+    }
@@ -1,23 +1,24 @@
 import time
 from selenium.webdriver.common.by import By
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 
-from config import CHROMEDRIVER_PATH, PREDEFINED_FIELDS
-from form_submit.utils import smart_match, contains_keywords, normalize, GROUP_KEYWORDS, solve_recaptcha
+from config import PREDEFINED_FIELDS
+from utils.browser_utils import create_driver, quit_driver
+from form_submit.utils import smart_match, contains_keywords, normalize, GROUP_KEYWORDS
+from form_submit.captcha import (cancel_captcha_solve, find_captcha, find_captcha_in_page,
+                                 inject_captcha_token, start_captcha_solve, wait_captcha_token)
+from utils.tracing import span, record_span
 
 
-def fill_and_submit_form(form_url, log):
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--log-level=3")
-    options.add_experimental_option("excludeSwitches", ["enable-logging"])
-
-    service = Service(CHROMEDRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=options)
+def fill_and_submit_form(form_url, log, form_html=None):
+    start_time = time.time()
+    # The stored form HTML usually carries the sitekey already, so the solve
+    # runs while Chrome starts and the fields are filled
+    solve = None
+    captcha = find_captcha(form_html)
+    if captcha:
+        solve = start_captcha_solve(form_url, captcha)
 
+    driver = None
     log_data = {
         "url": form_url,
         "filled_fields": [],
@@ -26,20 +27,26 @@ def fill_and_submit_form(form_url, log):
         "captcha_present": False,
         "captcha_solved": False,
         "captcha_fallback_used": False,
-        "captcha_error": ""
+        "captcha_error": "",
+        "captcha_solve_s": None,
+        "captcha_wait_s": None
     }
 
     try:
-        driver.get(form_url)
-        time.sleep(2)
+        # Inside the try: if Chrome fails to start, the solve started above
+        # is still cancelled and the submission is still logged
+        with span(log, "form_submission:chrome_start"):
+            driver = create_driver(form_url)
 
-        # Detect and solve CAPTCHA (via Anti-Captcha)
-        captcha_present, captcha_solved, fallback_used, captcha_error = solve_recaptcha(
-            driver, form_url)
-        log_data["captcha_present"] = captcha_present
-        log_data["captcha_solved"] = captcha_solved
-        log_data["captcha_fallback_used"] = fallback_used
-        log_data["captcha_error"] = captcha_error
+        with span(log, "form_submission:page_load"):
+            driver.get(form_url)
+            time.sleep(2)
+
+        # Captcha outside the stored form HTML: start solving now
+        if solve is None:
+            captcha = find_captcha_in_page(driver)
+            if captcha:
+                solve = start_captcha_solve(form_url, captcha)
 
         fields = driver.find_elements(
             By.XPATH, "//input | //textarea | //select")
@@ -120,14 +127,38 @@ def fill_and_submit_form(form_url, log):
             except Exception as fe:
                 log_data["errors"].append(str(fe))
 
+        if solve:
+            # Only the part of the solve the filling did not cover is waited for
+            wait_start = time.time()
+            with span(log, "form_submission:captcha_wait"):
+                token = wait_captcha_token(solve)
+            log_data["captcha_wait_s"] = round(time.time() - wait_start, 2)
+            if token:
+                inject_captcha_token(driver, solve['kind'], token)
+                log_data["captcha_solved"] = True
+                print("✅ CAPTCHA Solved and injected.")
+            else:
+                print(f"[INFO] CAPTCHA solve failed: {solve['error']}")
+
         log_data["submit_clicked"] = attempt_submit(driver)
         time.sleep(2)
 
     except Exception as e:
         log_data["errors"].append(str(e))
     finally:
-        driver.quit()
+        if driver is not None:
+            quit_driver(driver)
+        log_data["captcha_present"] = solve is not None
+        if solve:
+            # No-op when the token was used; stops polling for skipped forms
+            cancel_captcha_solve(solve)
+            log_data["captcha_kind"] = solve['kind']
+            log_data["captcha_backend"] = solve['backend']
+            log_data["captcha_error"] = solve['error']
+            log_data["captcha_solve_s"] = solve['solve_s']
+            log_data["captcha_cost_usd"] = solve['cost_usd']
         log['form_submission'] = log_data
+        record_span(log, "form_submission", time.time() - start_time, start_time)
 
 
 def attempt_submit(driver):
@@ -0,0 +1,38 @@
+import json
+import threading
+
+from mock_llm.recordings import prompt_key
+from config import LLM_BACKEND, LLM_RECORDINGS_PATH, MOCK_LLM_URL
+from resources import get_openai_client
+
+_mock_client = None
+_lock = threading.Lock()
+
+
+def get_llm_client():
+    global _mock_client
+    if LLM_BACKEND == "openai":
+        return get_openai_client()
+    if LLM_BACKEND == "mock":
+        with _lock:
+            if _mock_client is None:
+                from openai import OpenAI
+                _mock_client = OpenAI(api_key="mock", base_url=MOCK_LLM_URL)
+                print(f"[LLM] Using the mock server at {MOCK_LLM_URL}")
+            return _mock_client
+    raise ValueError(f"Unknown LLM_BACKEND: {LLM_BACKEND}")
+
+
+def record_response(model, prompt, schema_name, output_text):
+    # Builds the replay file for `python -m mock_llm.server --recordings`
+    if not LLM_RECORDINGS_PATH or LLM_BACKEND == "mock":
+        return
+    entry = {
+        'key': prompt_key(model, prompt, schema_name),
+        'model': model,
+        'schema': schema_name or "",
+        'output_text': output_text,
+    }
+    with _lock:
+        with open(LLM_RECORDINGS_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -0,0 +1,46 @@
+import time
+
+from gpt.ledger import record_gpt_call
+from gpt.schemas import parse_structured, response_format
+from utils.token_utils import count_tokens
+from utils.tracing import record_span
+from gpt.backends import get_llm_client, record_response
+from config import GPT_MODEL
+
+
+def create_response(prompt, log, purpose, model=GPT_MODEL, schema=None):
+    request = {
+        'model': model,
+        'input': [{"role": "user", "content": prompt}],
+    }
+    if schema:
+        request['text'] = response_format(schema)
+
+    start_time = time.time()
+    try:
+        response = get_llm_client().responses.create(**request)
+    except Exception as e:
+        record_span(log, f"gpt:{purpose}", time.time() - start_time, start_time)
+        record_gpt_call(log, purpose, model, 0, 0,
+                        time.time() - start_time, error=str(e))
+        raise
+
+    latency = time.time() - start_time
+    record_span(log, f"gpt:{purpose}", latency, start_time)
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        input_tokens = usage.input_tokens
+        output_tokens = usage.output_tokens
+    else:
+        input_tokens = count_tokens(prompt, model)
+        output_tokens = count_tokens(response.output_text, model)
+
+    record_gpt_call(log, purpose, getattr(response, "model", None) or model,
+                    input_tokens, output_tokens, latency)
+    record_response(model, prompt, schema, response.output_text)
+    return response
+
+
+def create_structured_response(prompt, log, purpose, schema, model=GPT_MODEL):
+    response = create_response(prompt, log, purpose, model, schema=schema)
+    return parse_structured(response.output_text, schema)
@@ -1,51 +1,37 @@
-import os
-from openai import OpenAI
-from gpt.summarizers import summarize_page_text
-from config import AVAILABLE_TEXT_TOKENS, GPT_COST_PER_TOKEN
+from gpt.client import create_structured_response
+from utils.token_utils import count_tokens
+from config import AVAILABLE_TEXT_TOKENS
 
-key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=key)
 
+def record_form_verdict(log, page_url, form_schema, relevant):
+    # GPT's verdict next to the exact schema it saw; the training script
+    # reads these back from the run logs
+    log.setdefault('form_verdicts', []).append({
+        'url': page_url,
+        'schema': form_schema,
+        'relevant': relevant,
+    })
 
-def evaluate_form_relevance_with_gpt(form_html, page_text, log):
-    try:
-        if 'token_usage' not in log:
-            log['token_usage'] = {
-                'tokens_used': 0,
-                'summarize_calls': 0,
-                'estimated_cost_usd': 0.0
-            }
-
-        if len(form_html) + len(page_text) > AVAILABLE_TEXT_TOKENS:
-            log['token_usage']['summarize_calls'] += 1
-            page_text = summarize_page_text(page_text, log)
-
-        prompt = f"""You are evaluating whether an HTML form is explicitly meant for advertising, sponsorship, or marketing inquiries — not general contact.
 
-Form HTML:
-{form_html}
+def evaluate_form_relevance_with_gpt(form_schema, log, page_url=""):
+    try:
+        prompt = f"""You are evaluating whether a web form is explicitly meant for advertising, sponsorship, or marketing inquiries — not general contact.
 
-Page Text:
-{page_text}
+Form description (page title, headings, fields, submit button and nearby text):
+{form_schema}
 
 Instructions:
-- Only respond with "True" if the form is clearly intended for advertising, marketing, sponsorship, or media-related business.
+- The form is relevant only if it is clearly intended for advertising, marketing, sponsorship, or media-related business.
 - Ignore generic contact forms, support requests, customer service, sales inquiries, or job applications.
 - Look for strong cues like: "advertise with us", "sponsorship opportunities", "marketing inquiry", "media kit", "promote your product", etc.
-- If uncertain or unclear, respond with "False".
-
-Respond ONLY with: True or False (exactly one of these)."""
+- If uncertain or unclear, set "relevant" to false.
 
-        token_est = len(prompt.split())
-        log['token_usage']['tokens_used'] += token_est
-        log['token_usage']['estimated_cost_usd'] += token_est * GPT_COST_PER_TOKEN
+Set "relevant" to true only if the form is clearly for advertising, marketing, sponsorship, or media-related business."""
 
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=[{"role": "user", "content": prompt}]
-        )
-        reply = response.output_text.strip().lower()
-        return reply == "true"
+        result = create_structured_response(
+            prompt, log, "form_relevance", "form_relevance")
+        record_form_verdict(log, page_url, form_schema, result["relevant"])
+        return result["relevant"]
     except Exception as e:
         print(f"[API ERROR] Failed to evaluate form relevance: {e}")
         return False
@@ -56,23 +42,68 @@ def choose_best_form_using_gpt(summary_dict, log):
     prompt = (
         "Given the following numbered summaries of different contact forms found across a website, "
         "choose the ONE most relevant for advertising, marketing, or press inquiries. "
-        "Only return the number of the most appropriate summary.\n\n"
+        "Return the number of the most appropriate summary as \"choice\", or null if none fits.\n\n"
     )
     for key, summary in summary_dict.items():
         prompt += f"{key}: {summary}\n"
-    prompt += "\nReturn only the number (e.g., 2)."
 
     try:
-        token_est = len(prompt.split())
-        log['token_usage']['tokens_used'] += token_est
-        log['token_usage']['estimated_cost_usd'] += token_est * GPT_COST_PER_TOKEN
-
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=[{"role": "user", "content": prompt}]
-        )
-        result = response.output_text.strip()
-        return int(result) if result.isdigit() else None
+        result = create_structured_response(
+            prompt, log, "choose_form", "form_choice")
+        return result["choice"]
     except Exception as e:
         print(f"[API ERROR] Failed to select best form: {e}")
         return None
+
+
+def evaluate_forms_batch_with_gpt(forms_dict, log):
+    print(f"\nEvaluating {len(forms_dict)} candidate forms in one request...")
+    numbered = dict(enumerate(forms_dict.keys(), start=1))
+
+    prompt = """You are evaluating candidate web forms found across one website. For each form decide whether it is explicitly meant for advertising, sponsorship, or marketing inquiries — not general contact — and pick the single best form for an advertising inquiry.
+
+Instructions:
+- A form is relevant only if it is clearly intended for advertising, marketing, sponsorship, or media-related business.
+- Ignore generic contact forms, support requests, customer service, sales inquiries, or job applications.
+- Look for strong cues like: "advertise with us", "sponsorship opportunities", "marketing inquiry", "media kit", "promote your product", etc.
+- If uncertain or unclear, mark the form as not relevant.
+- "best" must be the number of a relevant form, or null if none is relevant.
+
+"""
+    for number, key in numbered.items():
+        form_schema, url = forms_dict[key][1:3]
+        prompt += f"""### Form {number}
+URL: {url}
+{form_schema}
+
+"""
+    prompt += "For every form return its number, whether it is relevant, and a one-sentence summary of what the form is for."
+
+    if count_tokens(prompt) > AVAILABLE_TEXT_TOKENS:
+        print("[OVERFLOW] Batched form prompt exceeds the context budget.")
+        return None
+
+    try:
+        data = create_structured_response(
+            prompt, log, "form_batch", "form_batch")
+
+        verdicts = {'relevance': {}, 'summaries': {}, 'best': None}
+        for item in data["forms"]:
+            key = numbered.get(item["number"])
+            if key is None:
+                continue
+            verdicts['relevance'][key] = item["relevant"]
+            verdicts['summaries'][key] = item["summary"]
+
+        for key in forms_dict:
+            verdicts['relevance'].setdefault(key, False)
+            record_form_verdict(log, forms_dict[key][2], forms_dict[key][1],
+                                verdicts['relevance'][key])
+
+        best = numbered.get(data["best"])
+        if best is not None and verdicts['relevance'][best]:
+            verdicts['best'] = best
+        return verdicts
+    except Exception as e:
+        print(f"[API ERROR] Failed to evaluate forms in batch: {e}")
+        return None
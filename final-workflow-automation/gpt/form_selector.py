@@ -1,15 +1,15 @@
 import json
-import os
-from openai import OpenAI
+from concurrent.futures import Future
 
-from gpt.evaluators import choose_best_form_using_gpt
+from gpt.client import create_structured_response
+from gpt.evaluators import choose_best_form_using_gpt, evaluate_form_relevance_with_gpt, evaluate_forms_batch_with_gpt
 from gpt.summarizers import summarize_form_text_for_selection
 from extraction.form_extraction import parse_form_fields, extract_submit_button
+from gpt.pool import submit_gpt_task, map_gpt_tasks
+from extraction.form_classifier import classify_form_locally
+from extraction.form_model import is_form_relevant_by_model, load_form_model, predict_form_relevance
 from form_submit.fill_form import fill_and_submit_form
-from config import GPT_COST_PER_TOKEN
-
-key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=key)
+from config import FORM_EVALUATION_MODE, FORM_RELEVANCE_BACKEND, FORM_MODEL_THRESHOLD
 
 
 def gpt_choose_message_field(textarea_dict, log):
@@ -18,84 +18,209 @@ You are given a dictionary of form fields that are all unrequired <textarea> ele
 
 Each key is an index, and the value is a dictionary with field metadata.
 
-Your task is to determine which index most likely corresponds to the message box.
-
-ONLY RETURN THE INTEGER INDEX (e.g., 0, 1, etc.).
+Your task is to determine which index most likely corresponds to the message box and return it as "index".
 
 Here is the dictionary:\n{json.dumps(textarea_dict, indent=2)}
 """
     try:
-        token_est = len(prompt.split())
-        log['token_usage']['tokens_used'] += token_est
-        log['token_usage']['estimated_cost_usd'] += token_est * GPT_COST_PER_TOKEN
-
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=[{"role": "user", "content": prompt}]
-        )
-
-        output = response.output_text.strip()
-        return int(output) if output.isdigit() else next(iter(textarea_dict))
+        result = create_structured_response(
+            prompt, log, "message_field", "message_field")
+        for key in textarea_dict:
+            if str(key) == str(result["index"]):
+                return key
+        return next(iter(textarea_dict))
     except Exception as e:
         print(f"[API ERROR] GPT failed during message field selection: {e}")
         return next(iter(textarea_dict))
 
 
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def dispatch_form_evaluation(form_schema, page_url, log):
+    decision, _ = classify_form_locally(form_schema, page_url, log)
+    if decision != "uncertain":
+        return _resolved(decision == "accept")
+
+    if FORM_RELEVANCE_BACKEND == "local":
+        return _resolved(False)
+
+    if FORM_RELEVANCE_BACKEND == "model":
+        verdict = is_form_relevant_by_model(form_schema, page_url, log)
+        if verdict is not None:
+            return _resolved(verdict)
+
+    return submit_gpt_task(evaluate_form_relevance_with_gpt, form_schema, log, page_url)
+
+
+def join_form_verdicts(detected_forms_dict, pending_verdicts):
+    relevant = {}
+    for key, value in detected_forms_dict.items():
+        future = pending_verdicts.get(key)
+        if future is not None and future.result():
+            relevant[key] = value
+        else:
+            print(f"[SKIPPED] Form {key} not relevant. URL: {value[2]}")
+    detected_forms_dict.clear()
+    detected_forms_dict.update(relevant)
+
+
 def process_detected_forms(log, detected_forms_dict):
     if len(detected_forms_dict) == 0:
         print("\n0 forms detected in process_detected_forms")
         return None
 
-    if len(detected_forms_dict) == 1:
-        key, value = list(detected_forms_dict.items())[0]
-        html, text, url = value
+    if FORM_EVALUATION_MODE == "batch":
+        return select_form_batched(log, detected_forms_dict)
+
+    return select_form_per_form(log, detected_forms_dict)
+
+
+def select_form_batched(log, detected_forms_dict):
+    decisions = {
+        key: classify_form_locally(value[1], value[2], log)
+        for key, value in detected_forms_dict.items()
+    }
+    accepted = {key: score for key, (decision, score) in decisions.items()
+                if decision == "accept"}
+
+    if accepted:
+        # Strong advertising cues settle the choice without GPT
+        best = max(accepted, key=accepted.get)
+        relevant = {key: detected_forms_dict[key] for key in accepted}
+        detected_forms_dict.clear()
+        detected_forms_dict.update(relevant)
+        log['form_evaluation'] = {
+            'mode': 'local',
+            'candidates': len(decisions),
+            'relevant': len(relevant),
+        }
+
+        html, text, url = relevant[best][:3]
 
-        fill_and_submit_form(url, log)
+        fill_and_submit_form(url, log, html)
 
         return {
             'page_url': url,
             'summary': '',
         }
 
-    summarized_dict = {}
-    new_dict = {}
+    uncertain = {key: detected_forms_dict[key]
+                 for key, (decision, _) in decisions.items()
+                 if decision == "uncertain"}
+    detected_forms_dict.clear()
+    detected_forms_dict.update(uncertain)
 
-    for i, (idx, value) in enumerate(detected_forms_dict.items(), start=1):
-        html, text, url = value
-        log['token_usage']['summarize_calls'] += 1
-        summarized = summarize_form_text_for_selection(f"{html}\n{text}", log)
-        summarized_dict[i] = summarized
-        new_dict[i] = [html, text, url, summarized]
+    if not uncertain:
+        print("[SKIPPED] All candidate forms rejected locally.")
+        return None
 
+    if FORM_RELEVANCE_BACKEND == "local":
+        print("[SKIPPED] Candidate forms left uncertain by the cascade.")
+        log['form_evaluation'] = {
+            'mode': 'local',
+            'candidates': len(decisions),
+            'relevant': 0,
+        }
+        detected_forms_dict.clear()
+        return None
+
+    if FORM_RELEVANCE_BACKEND == "model" and load_form_model() is not None:
+        return select_form_by_model(log, detected_forms_dict)
+
+    verdicts = evaluate_forms_batch_with_gpt(detected_forms_dict, log)
+
+    if verdicts is None:
+        print("[FALLBACK] Evaluating candidate forms one by one.")
+        log['form_evaluation'] = {'mode': 'per_form_fallback'}
+        # Local decisions are already made, so these all go to GPT
+        pending = {
+            key: submit_gpt_task(
+                evaluate_form_relevance_with_gpt, value[1], log, value[2])
+            for key, value in detected_forms_dict.items()
+        }
+        join_form_verdicts(detected_forms_dict, pending)
+        return select_form_per_form(log, detected_forms_dict)
+
+    log['form_evaluation'] = {
+        'mode': 'batch',
+        'candidates': len(detected_forms_dict),
+        'relevant': sum(verdicts['relevance'].values()),
+    }
+
+    relevant = {key: value for key, value in detected_forms_dict.items()
+                if verdicts['relevance'][key]}
     detected_forms_dict.clear()
-    detected_forms_dict.update(new_dict)
+    detected_forms_dict.update(relevant)
 
-    chosen_key = choose_best_form_using_gpt(summarized_dict, log)
+    if not relevant:
+        print("[SKIPPED] No candidate form judged relevant.")
+        return None
 
-    if isinstance(chosen_key, int) and chosen_key in detected_forms_dict:
-        html, text, url, summary = detected_forms_dict[chosen_key]
+    best = verdicts['best']
+    if best is None:
+        best = next(iter(relevant))
+        print(f"[WARNING] No best form returned by GPT, using form {best}.")
+
+    html, text, url = relevant[best][:3]
+
+    fill_and_submit_form(url, log, html)
+
+    return {
+        'page_url': url,
+        'summary': verdicts['summaries'].get(best, ''),
+    }
+
+
+def select_form_by_model(log, detected_forms_dict):
+    probabilities = {
+        key: predict_form_relevance(value[1])
+        for key, value in detected_forms_dict.items()
+    }
+    for key, value in detected_forms_dict.items():
+        log.setdefault('form_model', []).append({
+            'url': value[2],
+            'probability': round(probabilities[key], 4),
+        })
+
+    relevant = {key: value for key, value in detected_forms_dict.items()
+                if probabilities[key] >= FORM_MODEL_THRESHOLD}
+    log['form_evaluation'] = {
+        'mode': 'model',
+        'candidates': len(detected_forms_dict),
+        'relevant': len(relevant),
+    }
+    detected_forms_dict.clear()
+    detected_forms_dict.update(relevant)
 
-        fill_and_submit_form(url, log)
+    if not relevant:
+        print("[SKIPPED] No candidate form judged relevant by the model.")
+        return None
 
-        return {
-            'page_url': url,
-            'summary': summary,
-        }
+    best = max(relevant, key=probabilities.get)
+    html, text, url = relevant[best][:3]
 
-    print(f"[WARNING] No valid form selected by GPT. Got: {chosen_key}")
-    return None
+    fill_and_submit_form(url, log, html)
 
+    return {
+        'page_url': url,
+        'summary': '',
+    }
 
-def process_detected_forms(log, detected_forms_dict):
+
+def select_form_per_form(log, detected_forms_dict):
     if len(detected_forms_dict) == 0:
-        print("\n0 forms detected in process_detected_forms")
+        print("\n0 relevant forms left to choose from")
         return None
 
     if len(detected_forms_dict) == 1:
         key, value = list(detected_forms_dict.items())[0]
         html, text, url = value
 
-        fill_and_submit_form(url, log)
+        fill_and_submit_form(url, log, html)
 
         return {
             'page_url': url,
@@ -105,9 +230,13 @@ def process_detected_forms(log, detected_forms_dict):
     summarized_dict = {}
     new_dict = {}
 
-    for i, (idx, value) in enumerate(detected_forms_dict.items(), start=1):
-        html, text, url = value
-        summarized = summarize_form_text_for_selection(f"{html}\n{text}", log)
+    forms = list(detected_forms_dict.values())
+    summaries = map_gpt_tasks(
+        summarize_form_text_for_selection,
+        [text for html, text, url in forms],
+        [log] * len(forms))
+
+    for i, ((html, text, url), summarized) in enumerate(zip(forms, summaries), start=1):
         summarized_dict[i] = summarized
         new_dict[i] = [html, text, url, summarized]
 
@@ -119,7 +248,7 @@ def process_detected_forms(log, detected_forms_dict):
     if isinstance(chosen_key, int) and chosen_key in detected_forms_dict:
         html, text, url, summary = detected_forms_dict[chosen_key]
 
-        fill_and_submit_form(url, log)
+        fill_and_submit_form(url, log, html)
 
         return {
             'page_url': url,
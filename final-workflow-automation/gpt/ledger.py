@@ -0,0 +1,121 @@
+import json
+import threading
+from datetime import datetime
+
+from config import GPT_MODEL_PRICES
+
+SUMMARIZE_PURPOSES = {"summarize_page", "summarize_form"}
+
+_lock = threading.Lock()
+_run_ledger = {
+    'started_at': datetime.now().isoformat(timespec="seconds"),
+    'totals': {},
+    'by_model': {},
+    'by_purpose': {},
+    'by_domain': {},
+}
+
+
+def new_token_usage():
+    return {
+        'tokens_used': 0,
+        'input_tokens': 0,
+        'output_tokens': 0,
+        'gpt_calls': 0,
+        'summarize_calls': 0,
+        'estimated_cost_usd': 0.0,
+        'calls': []
+    }
+
+
+def _empty_rollup():
+    return {
+        'calls': 0,
+        'input_tokens': 0,
+        'output_tokens': 0,
+        'latency_s': 0.0,
+        'cost_usd': 0.0,
+    }
+
+
+def _add_to_rollup(rollup, call):
+    rollup['calls'] += 1
+    rollup['input_tokens'] += call['input_tokens']
+    rollup['output_tokens'] += call['output_tokens']
+    rollup['latency_s'] = round(rollup['latency_s'] + call['latency_s'], 3)
+    rollup['cost_usd'] = round(rollup['cost_usd'] + call['cost_usd'], 6)
+
+
+def compute_cost(model, input_tokens, output_tokens):
+    prices = GPT_MODEL_PRICES.get(model)
+    if prices is None:
+        # Dated snapshots such as "gpt-4o-mini-2024-07-18" share the base price
+        base = max((m for m in GPT_MODEL_PRICES if model.startswith(m)),
+                   key=len, default=None)
+        if base is None:
+            print(f"[WARN] No price configured for model {model}")
+            return 0.0
+        prices = GPT_MODEL_PRICES[base]
+    return (input_tokens * prices['input'] + output_tokens * prices['output']) / 1_000_000
+
+
+def record_gpt_call(log, purpose, model, input_tokens, output_tokens, latency_s, error=""):
+    call = {
+        'purpose': purpose,
+        'model': model,
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'latency_s': round(latency_s, 3),
+        'cost_usd': round(compute_cost(model, input_tokens, output_tokens), 6),
+    }
+    if error:
+        call['error'] = error
+
+    domain = log.get('domain', '')
+
+    with _lock:
+        if 'token_usage' not in log:
+            log['token_usage'] = new_token_usage()
+        usage = log['token_usage']
+        usage['gpt_calls'] += 1
+        if purpose in SUMMARIZE_PURPOSES:
+            usage['summarize_calls'] += 1
+        usage['input_tokens'] += input_tokens
+        usage['output_tokens'] += output_tokens
+        usage['tokens_used'] += input_tokens + output_tokens
+        usage['estimated_cost_usd'] = round(
+            usage['estimated_cost_usd'] + call['cost_usd'], 6)
+        usage['calls'].append(call)
+
+        _add_to_rollup(_run_ledger['totals'].setdefault(
+            'all', _empty_rollup()), call)
+        _add_to_rollup(_run_ledger['by_model'].setdefault(
+            model, _empty_rollup()), call)
+        _add_to_rollup(_run_ledger['by_purpose'].setdefault(
+            purpose, _empty_rollup()), call)
+        _add_to_rollup(_run_ledger['by_domain'].setdefault(
+            domain, _empty_rollup()), call)
+
+    return call
+
+
+def get_run_ledger():
+    with _lock:
+        return json.loads(json.dumps(_run_ledger))
+
+
+def get_run_cost():
+    with _lock:
+        return _run_ledger['totals'].get('all', _empty_rollup())['cost_usd']
+
+
+def write_run_ledger(path):
+    ledger = get_run_ledger()
+    ledger['finished_at'] = datetime.now().isoformat(timespec="seconds")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(ledger, f, indent=2)
+
+    totals = ledger['totals'].get('all', _empty_rollup())
+    print(f"\nGPT ledger: {totals['calls']} calls, "
+          f"{totals['input_tokens']} in / {totals['output_tokens']} out tokens, "
+          f"${totals['cost_usd']:.4f} — written to {path}")
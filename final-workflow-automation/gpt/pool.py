@@ -0,0 +1,26 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import GPT_MAX_WORKERS
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_gpt_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=GPT_MAX_WORKERS, thread_name_prefix="gpt")
+        return _executor
+
+
+def submit_gpt_task(func, *args):
+    return get_gpt_executor().submit(func, *args)
+
+
+def map_gpt_tasks(func, *iterables):
+    # Results come back in input order
+    futures = [submit_gpt_task(func, *args) for args in zip(*iterables)]
+    return [future.result() for future in futures]
@@ -0,0 +1,125 @@
+import json
+
+
+class StructuredOutputError(ValueError):
+    pass
+
+
+def _object(properties):
+    # Strict structured outputs need every property listed as required
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+FORM_RELEVANCE_SCHEMA = _object({
+    "relevant": {"type": "boolean"},
+})
+
+FORM_BATCH_SCHEMA = _object({
+    "forms": {
+        "type": "array",
+        "items": _object({
+            "number": {"type": "integer"},
+            "relevant": {"type": "boolean"},
+            "summary": {"type": "string"},
+        }),
+    },
+    "best": {"type": ["integer", "null"]},
+})
+
+FORM_CHOICE_SCHEMA = _object({
+    "choice": {"type": ["integer", "null"]},
+})
+
+MESSAGE_FIELD_SCHEMA = _object({
+    "index": {"type": "integer"},
+})
+
+EMAIL_LIST_SCHEMA = _object({
+    "emails": {"type": "array", "items": {"type": "string"}},
+})
+
+PAGE_SUMMARY_SCHEMA = _object({
+    "summary": {"type": "string"},
+    "emails": {
+        "type": "array",
+        "items": _object({
+            "email": {"type": "string"},
+            "context": {"type": "string"},
+        }),
+    },
+})
+
+FORM_SUMMARY_SCHEMA = _object({
+    "summary": {"type": "string"},
+})
+
+SCHEMAS = {
+    "form_relevance": FORM_RELEVANCE_SCHEMA,
+    "form_batch": FORM_BATCH_SCHEMA,
+    "form_choice": FORM_CHOICE_SCHEMA,
+    "message_field": MESSAGE_FIELD_SCHEMA,
+    "email_list": EMAIL_LIST_SCHEMA,
+    "page_summary": PAGE_SUMMARY_SCHEMA,
+    "form_summary": FORM_SUMMARY_SCHEMA,
+}
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def response_format(name):
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": name,
+            "schema": SCHEMAS[name],
+            "strict": True,
+        }
+    }
+
+
+def validate(value, schema, path="$"):
+    types = schema.get("type")
+    types = types if isinstance(types, list) else [types]
+    if not any(_TYPE_CHECKS[t](value) for t in types):
+        raise StructuredOutputError(
+            f"{path}: expected {' or '.join(types)}, got {type(value).__name__}")
+    if "enum" in schema and value not in schema["enum"]:
+        raise StructuredOutputError(f"{path}: {value!r} not in {schema['enum']}")
+
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                raise StructuredOutputError(f"{path}: missing '{key}'")
+        properties = schema.get("properties", {})
+        for key, item in value.items():
+            if key in properties:
+                validate(item, properties[key], f"{path}.{key}")
+            elif schema.get("additionalProperties") is False:
+                raise StructuredOutputError(f"{path}: unexpected '{key}'")
+
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            validate(item, schema["items"], f"{path}[{i}]")
+
+    return value
+
+
+def parse_structured(text, name):
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"reply is not JSON: {e}") from e
+    return validate(data, SCHEMAS[name])
@@ -1,48 +1,75 @@
-import os
-from openai import OpenAI
-from config import AVAILABLE_TEXT_TOKENS, GPT_COST_PER_TOKEN
+import re
 
-key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=key)
+from gpt.client import create_structured_response
+from gpt.pool import map_gpt_tasks
+from utils.token_utils import count_tokens, split_into_chunks, truncate_to_tokens
+from config import SUMMARY_INPUT_TOKENS
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
 
 
 def summarize_page_text(text, log):
     prompt = (
         "Summarize the following webpage content and extract only the email addresses and their contexts relevant to marketing, advertising or press.\n\n"
-        f"{text[:3000]}"
+        f"{truncate_to_tokens(text, SUMMARY_INPUT_TOKENS)}"
     )
     try:
-        token_est = len(prompt.split())
-        log['token_usage']['summarize_calls'] += 1
-        log['token_usage']['tokens_used'] += token_est
-        log['token_usage']['estimated_cost_usd'] += token_est * GPT_COST_PER_TOKEN
-
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=[{"role": "user", "content": prompt}]
-        )
-        return response.output_text.strip()
+        result = create_structured_response(
+            prompt, log, "summarize_page", "page_summary")
+        lines = [result["summary"].strip()]
+        for item in result["emails"]:
+            lines.append(f"{item['email']} — {item['context']}")
+        return "\n".join(line for line in lines if line)
     except Exception as e:
         print(f"[API ERROR] Failed to summarize page: {e}")
         return ""
 
 
+def summarize_long_texts(texts, log):
+    # Map-reduce over every page at once: chunks that mention an email are
+    # kept verbatim, the rest are summarized in parallel, and each page is
+    # stitched back together in its original order.
+    pages = {}
+    pending = []
+    for key, text in texts.items():
+        if count_tokens(text) <= SUMMARY_INPUT_TOKENS:
+            chunks = [text]
+        else:
+            chunks = split_into_chunks(text, SUMMARY_INPUT_TOKENS)
+        parts = []
+        for chunk in chunks:
+            if EMAIL_PATTERN.search(chunk):
+                parts.append(chunk)
+            else:
+                parts.append(None)
+                pending.append((key, len(parts) - 1, chunk))
+        pages[key] = parts
+
+    kept = sum(part is not None for parts in pages.values() for part in parts)
+    print(f"[SUMMARY] {len(pending)} chunks to summarize, {kept} kept for their emails")
+
+    summaries = map_gpt_tasks(
+        summarize_page_text,
+        [chunk for _, _, chunk in pending],
+        [log] * len(pending),
+    )
+    for (key, index, _), summary in zip(pending, summaries):
+        pages[key][index] = summary
+
+    return {key: "\n\n".join(part for part in parts if part)
+            for key, parts in pages.items()}
+
+
 def summarize_form_text_for_selection(content, log):
     prompt = (
-        "Summarize the purpose of the following webpage HTML form and page content in one sentence. "
+        "Summarize the purpose of the following web form description in one sentence. "
         "Indicate what the form is about and what kind of contact it's intended for:\n"
         f"{content}"
     )
     try:
-        token_est = len(prompt.split())
-        log['token_usage']['tokens_used'] += token_est
-        log['token_usage']['estimated_cost_usd'] += token_est * GPT_COST_PER_TOKEN
-
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=[{"role": "user", "content": prompt}]
-        )
-        return response.output_text.strip()
+        result = create_structured_response(
+            prompt, log, "summarize_form", "form_summary")
+        return result["summary"].strip()
     except Exception as e:
         print(f"[API ERROR] Failed to summarize form content: {e}")
         return ""
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+from loadtest.site_farm import site_names, start_site_farm
+from mock_llm.server import STATS as LLM_STATS, start_mock_llm
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT_DIR = BASE_DIR / "data" / "loadtest"
+
+
+def process_tree(process):
+    try:
+        return [process] + process.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return []
+
+
+def sample_resources(process, samples, known):
+    # CPU is summed over the pipeline and its Chrome/chromedriver children.
+    # cpu_percent() measures since the previous call on the same Process
+    # object, so `known` keeps one object per pid across samples; a process
+    # seen for the first time is only primed and counts from the next sample.
+    cpu = rss = 0.0
+    tree = process_tree(process)
+    alive = {}
+    for proc in tree:
+        cached = known.get(proc.pid)
+        first_seen = cached is None or not cached.is_running()
+        proc = proc if first_seen else cached
+        try:
+            usage = proc.cpu_percent(interval=None)
+            rss += proc.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+        if not first_seen:
+            cpu += usage
+        alive[proc.pid] = proc
+    known.clear()
+    known.update(alive)
+    samples.append({'cpu_percent': cpu, 'rss_mb': rss / 1024 / 1024, 'processes': len(tree)})
+
+
+def read_results(results_path):
+    if not results_path.exists():
+        return []
+    connection = sqlite3.connect(results_path)
+    try:
+        return [
+            {'domain': domain, 'timed_out': bool(timed_out), 'emails': emails, 'form_url': form_url}
+            for domain, timed_out, emails, form_url in connection.execute(
+                "SELECT domain, timed_out, emails, form_url FROM results ORDER BY id")
+        ]
+    finally:
+        connection.close()
+
+
+def run(args):
+    output_dir = Path(args.output_dir) / time.strftime("%Y%m%d-%H%M%S")
+    run_dir = output_dir / "run"
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    farm = start_site_farm(args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           scroll_pages=args.scroll_pages, captcha_rate=args.captcha_rate)
+    llm = start_mock_llm(args.openai_port, recordings=args.recordings,
+                         latency_ms=args.openai_latency_ms, error_rate=args.openai_error_rate)
+
+    domains_path = output_dir / "domains.txt"
+    domains_path.write_text("\n".join(site_names(args.sites, args.port)) + "\n", encoding="utf-8")
+
+    env = dict(os.environ)
+    env.update({
+        'DOMAINS_TXT_PATH': str(domains_path),
+        'DOMAIN_URL_SCHEME': "http",
+        'RUN_LOGS_DIR': str(run_dir),
+        'OUTPUT_CSV_PATH': str(output_dir / "summary.csv"),
+        'DOMAIN_CACHE_ENABLED': "0",
+        'LLM_BACKEND': "mock",
+        'MOCK_LLM_URL': f"http://127.0.0.1:{args.openai_port}/v1",
+        'CAPTCHA_BACKEND': "fake",
+    })
+    if args.chromedriver:
+        env['CHROMEDRIVER_PATH'] = args.chromedriver
+
+    print(f"[LOADTEST] {args.sites} sites, output in {output_dir}")
+    start = time.time()
+    pipeline = subprocess.Popen(
+        [sys.executable, "-m", "processing.main"], cwd=BASE_DIR, env=env,
+        stdout=open(output_dir / "pipeline.log", "w", encoding="utf-8"),
+        stderr=subprocess.STDOUT)
+    monitor = psutil.Process(pipeline.pid)
+
+    samples = []
+    known = {}
+    while pipeline.poll() is None:
+        sample_resources(monitor, samples, known)
+        time.sleep(args.sample_interval)
+    elapsed = time.time() - start
+
+    farm.shutdown()
+    llm.shutdown()
+
+    results = read_results(run_dir / "results.sqlite")
+    timing_path = run_dir / "timing_report.json"
+    stage_timings = json.loads(timing_path.read_text(encoding="utf-8")) if timing_path.exists() else {}
+    # The first sample only primes psutil's CPU counters
+    measured = samples[1:] or samples
+
+    report = {
+        'sites': args.sites,
+        'exit_code': pipeline.returncode,
+        'elapsed_s': round(elapsed, 1),
+        'domains_done': len(results),
+        'domains_per_min': round(len(results) / elapsed * 60, 2) if elapsed else 0.0,
+        'timeouts': sum(r['timed_out'] for r in results),
+        'with_emails': sum(bool(r['emails']) for r in results),
+        'with_submitted_form': sum(bool(r['form_url']) for r in results),
+        'llm_requests': LLM_STATS['requests'],
+        'llm_errors_injected': LLM_STATS['errors_injected'],
+        'llm_by_schema': LLM_STATS['by_schema'],
+        'cpu_percent_avg': round(sum(s['cpu_percent'] for s in measured) / len(measured), 1) if measured else 0.0,
+        'cpu_percent_max': round(max((s['cpu_percent'] for s in measured), default=0.0), 1),
+        'rss_mb_peak': round(max((s['rss_mb'] for s in measured), default=0.0), 1),
+        'processes_peak': max((s['processes'] for s in measured), default=0),
+        'stage_timings': stage_timings,
+        'settings': vars(args),
+    }
+
+    report_path = output_dir / "loadtest_report.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n[LOADTEST] {report['domains_done']}/{args.sites} domains in {report['elapsed_s']}s "
+          f"({report['domains_per_min']}/min), {report['timeouts']} timeouts")
+    print(f"[LOADTEST] CPU avg {report['cpu_percent_avg']}% / max {report['cpu_percent_max']}%, "
+          f"peak RSS {report['rss_mb_peak']} MB over {report['processes_peak']} processes")
+    print(f"[LOADTEST] {report['llm_requests']} LLM requests served by the mock server")
+    print(f"[LOADTEST] Report written to {report_path}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the pipeline against local synthetic sites and the mock LLM server")
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--openai-port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--openai-latency-ms", type=float, default=300)
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--recordings", help="recorded LLM responses to replay")
+    parser.add_argument("--scroll-pages", type=int, default=3)
+    parser.add_argument("--captcha-rate", type=float, default=0.3)
+    parser.add_argument("--chromedriver", help="chromedriver binary for this machine")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR))
+    run(parser.parse_args())
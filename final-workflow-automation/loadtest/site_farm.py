@@ -0,0 +1,218 @@
+import argparse
+import hashlib
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Synthetic publisher sites served from one process. Every *.localhost host
+# name resolves to 127.0.0.1 in Chrome, so "site042.localhost:8800" is a
+# separate site whose content is derived from its name.
+
+NAV_PAGES = [
+    ("Home", "/"),
+    ("About us", "/about"),
+    ("Contact", "/contact"),
+    ("Advertise", "/advertise"),
+    ("Blog", "/blog"),
+    ("Press", "/press"),
+    ("Terms", "/terms"),
+    ("Privacy policy", "/privacy"),
+]
+WORDS = ("market news story report analysis local city team editor update "
+         "review guide weekly business sports culture event opinion").split()
+
+# Test sitekeys published by each vendor; they always pass
+CAPTCHA_WIDGETS = [
+    '<div class="g-recaptcha" data-sitekey="6LeIxAcTAAAAAJcZVRqyHh71UMIEGNQ_MXjiZKhI"></div>',
+    '<div class="h-captcha" data-sitekey="10000000-ffff-ffff-ffff-000000000001"></div>'
+    '<textarea name="h-captcha-response" style="display:none"></textarea>',
+    '<div class="cf-turnstile" data-sitekey="1x00000000000000000000AA"></div>'
+    '<input type="hidden" name="cf-turnstile-response">',
+]
+
+SETTINGS = {
+    'latency_ms': 0,
+    'jitter_ms': 0,
+    'scroll_pages': 3,
+    'captcha_rate': 0.3,
+}
+
+
+def site_rng(host, salt=""):
+    seed = hashlib.md5(f"{host}{salt}".encode("utf-8")).hexdigest()
+    return random.Random(int(seed[:8], 16))
+
+
+def paragraph(rng, words=60):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def cf_encode(email, key=0x5a):
+    return f"{key:02x}" + "".join(f"{ord(c) ^ key:02x}" for c in email)
+
+
+def obfuscated_email(rng, local, host):
+    style = rng.randrange(4)
+    email = f"{local}@{host}"
+    if style == 0:
+        return html.escape(email)
+    if style == 1:
+        return f"{local} [at] {host.replace('.', ' [dot] ')}"
+    if style == 2:
+        return f'<a href="mailto:{email}?subject=Hello">Email us</a>'
+    return (f'<a href="/cdn-cgi/l/email-protection" class="__cf_email__" '
+            f'data-cfemail="{cf_encode(email)}">[email&#160;protected]</a>')
+
+
+def layout(host, title, body, rng):
+    nav = "".join(f'<a href="{path}">{label}</a> ' for label, path in NAV_PAGES)
+    footer_links = "".join(
+        f'<a href="{path}">{label}</a> ' for label, path in NAV_PAGES[2:])
+    cookie = ('<div id="cookie-consent">We use cookies to improve your '
+              'experience. <button>Accept</button></div>')
+    return f"""<!DOCTYPE html>
+<html><head><title>{title} | {host}</title>
+<style>body {{ font-family: sans-serif; }}</style>
+<script>window.analytics = {{ site: "{host}" }};</script></head>
+<body>
+<header><nav>{nav}</nav></header>
+{cookie}
+<main><h1>{title}</h1>
+{body}
+</main>
+<footer><p>© {host} {rng.randint(2001, 2024)}. All rights reserved.</p>{footer_links}</footer>
+</body></html>"""
+
+
+def advertise_form(rng):
+    captcha = ""
+    if rng.random() < SETTINGS['captcha_rate']:
+        captcha = rng.choice(CAPTCHA_WIDGETS)
+    return f"""<h2>Advertise with us</h2>
+<p>Request our media kit and rate card for sponsorship and advertising opportunities.</p>
+<form action="/submit" method="post" id="advertising-inquiry">
+  <label for="name">Name</label><input type="text" id="name" name="name" required>
+  <label for="email">Email</label><input type="email" id="email" name="email" required>
+  <label for="company">Company</label><input type="text" id="company" name="company">
+  <label for="message">Message</label><textarea id="message" name="message"></textarea>
+  {captcha}
+  <button type="submit">Send inquiry</button>
+</form>"""
+
+
+def newsletter_form():
+    return """<form action="/subscribe" method="post" class="newsletter">
+  <input type="email" name="newsletter_email" placeholder="Subscribe to our newsletter">
+  <button type="submit">Subscribe</button>
+</form>"""
+
+
+def render_page(host, path, query):
+    rng = site_rng(host, path)
+    site = site_rng(host)
+    domain = host.split(":")[0]
+
+    if path == "/":
+        body = "".join(f"<p>{paragraph(rng)}</p>" for _ in range(6)) + newsletter_form()
+        return layout(host, "Latest news", body, rng)
+    if path == "/contact":
+        body = (f"<p>{paragraph(rng)}</p><p>General questions: "
+                f"{obfuscated_email(rng, 'info', domain)}</p>"
+                f"<p>Editorial: {obfuscated_email(rng, 'editor', domain)}</p>")
+        return layout(host, "Contact", body, rng)
+    if path == "/advertise":
+        body = (f"<p>{paragraph(rng)}</p><p>Advertising: "
+                f"{obfuscated_email(rng, site.choice(['ads', 'advertising', 'sales']), domain)}</p>"
+                + advertise_form(site))
+        return layout(host, "Advertise", body, rng)
+    if path == "/press":
+        body = f"<p>Press inquiries: {obfuscated_email(rng, 'press', domain)}</p>"
+        return layout(host, "Press", body, rng)
+    if path == "/blog":
+        # Infinite scroll: each scroll to the bottom loads one more chunk,
+        # up to scroll_pages chunks
+        body = f"""<div id="feed"><p>{paragraph(rng, 200)}</p></div>
+<script>
+var loaded = 0;
+window.addEventListener("scroll", function () {{
+  if (loaded >= {SETTINGS['scroll_pages']}) return;
+  if (window.innerHeight + window.scrollY < document.body.scrollHeight - 50) return;
+  loaded += 1;
+  fetch("/blog/chunk?n=" + loaded).then(function (r) {{ return r.text(); }})
+    .then(function (t) {{ document.getElementById("feed").insertAdjacentHTML("beforeend", t); }});
+}});
+</script>"""
+        return layout(host, "Blog", body, rng)
+    if path == "/blog/chunk":
+        n = query.get("n", ["0"])[0]
+        chunk_rng = site_rng(host, f"chunk{n}")
+        return "".join(f"<p style='min-height:800px'>{paragraph(chunk_rng, 120)}</p>" for _ in range(3))
+    if path in ("/about", "/terms", "/privacy"):
+        body = "".join(f"<p>{paragraph(rng)}</p>" for _ in range(4))
+        return layout(host, path.strip("/").title(), body, rng)
+    return None
+
+
+class SiteFarmHandler(BaseHTTPRequestHandler):
+    def _delay(self):
+        delay = SETTINGS['latency_ms'] + random.uniform(0, SETTINGS['jitter_ms'])
+        if delay:
+            time.sleep(delay / 1000)
+
+    def do_GET(self):
+        self._delay()
+        parsed = urlparse(self.path)
+        page = render_page(self.headers.get("Host", "localhost"),
+                           parsed.path.rstrip("/") or "/", parse_qs(parsed.query))
+        if page is None:
+            self.send_error(404)
+            return
+        data = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self._delay()
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        data = b"<html><body><p>Thank you, we will be in touch.</p></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def site_names(count, port):
+    return [f"site{i:03d}.localhost:{port}" for i in range(1, count + 1)]
+
+
+def start_site_farm(port=8800, **settings):
+    SETTINGS.update(settings)
+    server = ThreadingHTTPServer(("127.0.0.1", port), SiteFarmHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="site-farm", daemon=True).start()
+    print(f"[FARM] Serving synthetic sites on *.localhost:{port}")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve synthetic publisher sites")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--scroll-pages", type=int, default=3)
+    parser.add_argument("--captcha-rate", type=float, default=0.3)
+    args = parser.parse_args()
+    start_site_farm(args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                    scroll_pages=args.scroll_pages, captcha_rate=args.captcha_rate)
+    threading.Event().wait()
@@ -0,0 +1,8 @@
+import hashlib
+import json
+
+
+def prompt_key(model, prompt, schema_name):
+    # Identifies a request for record and replay
+    raw = json.dumps([model, prompt, schema_name or ""], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
@@ -0,0 +1,133 @@
+import json
+import re
+
+# Rule-based answers for the project's structured prompts, keyed by the
+# json_schema name each helper requests. They are deterministic: the same
+# prompt always gets the same answer.
+
+AD_CUES = re.compile(
+    r"advertis|sponsor|media kit|rate card|marketing inquir|partnership|promote your|ad placement",
+    re.I)
+NEGATIVE_CUES = re.compile(
+    r"newsletter|subscribe|log ?in|sign in|password|comment|job application|resume|careers", re.I)
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}", re.I)
+ROLE_ORDER = ["ads", "advertising", "advertise", "sponsor", "partnerships",
+              "marketing", "media", "sales", "press", "pr", "editor", "contact", "info"]
+MESSAGE_CUES = re.compile(r"message|comment|inquiry|enquiry|question|details", re.I)
+
+
+def default_for_schema(schema):
+    types = schema.get("type")
+    kind = types[0] if isinstance(types, list) else types
+    if kind == "object":
+        return {key: default_for_schema(value)
+                for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        return []
+    if kind == "boolean":
+        return False
+    if kind in ("integer", "number"):
+        return 1
+    if kind == "null":
+        return None
+    return ""
+
+
+def _ad_score(text):
+    return len(AD_CUES.findall(text)) - len(NEGATIVE_CUES.findall(text))
+
+
+def _first_sentence(text, limit=160):
+    text = " ".join(text.split())
+    match = re.search(r"(.+?[.!?])(\s|$)", text)
+    return (match.group(1) if match else text)[:limit]
+
+
+def form_relevance(prompt):
+    # Only the form description, not the instructions around it
+    match = re.search(r"nearby text\):\n(.*?)\n\nInstructions:", prompt, re.S)
+    return {'relevant': _ad_score(match.group(1) if match else prompt) > 0}
+
+
+def form_batch(prompt):
+    forms = []
+    best, best_score = None, 0
+    for number, body in re.findall(r"### Form (\d+)\n(.*?)(?=\n### Form |\Z)", prompt, re.S):
+        body = body.split("For every form return", 1)[0]
+        body = re.sub(r"^URL: .*$", "", body, flags=re.M)
+        score = _ad_score(body)
+        forms.append({
+            'number': int(number),
+            'relevant': score > 0,
+            'summary': _first_sentence(body),
+        })
+        if score > best_score:
+            best, best_score = int(number), score
+    return {'forms': forms, 'best': best}
+
+
+def form_choice(prompt):
+    best, best_score = None, 0
+    for number, summary in re.findall(r"^(\d+): (.*)$", prompt, re.M):
+        score = _ad_score(summary)
+        if score > best_score:
+            best, best_score = int(number), score
+    return {'choice': best}
+
+
+def message_field(prompt):
+    try:
+        fields = json.loads(prompt.split("Here is the dictionary:", 1)[1])
+    except (IndexError, ValueError):
+        return {'index': 0}
+    for key, meta in fields.items():
+        if MESSAGE_CUES.search(json.dumps(meta)):
+            return {'index': int(key) if str(key).isdigit() else 0}
+    first = next(iter(fields), "0")
+    return {'index': int(first) if str(first).isdigit() else 0}
+
+
+def _role_rank(email):
+    local = email.split("@")[0].lower()
+    for rank, role in enumerate(ROLE_ORDER):
+        if local.startswith(role):
+            return rank
+    return len(ROLE_ORDER)
+
+
+def email_list(prompt):
+    emails = list(dict.fromkeys(e.lower() for e in EMAIL_PATTERN.findall(prompt)))
+    return {'emails': sorted(emails, key=_role_rank)[:3]}
+
+
+def page_summary(prompt):
+    text = prompt.split("\n\n", 1)[-1]
+    emails = []
+    for match in EMAIL_PATTERN.finditer(text):
+        context = text[max(0, match.start() - 80):match.end() + 80]
+        emails.append({'email': match.group(0).lower(), 'context': " ".join(context.split())})
+    return {'summary': _first_sentence(text, 300), 'emails': emails[:10]}
+
+
+def form_summary(prompt):
+    content = prompt.split("contact it's intended for:", 1)[-1]
+    purpose = "advertising inquiries" if _ad_score(content) > 0 else "general contact"
+    return {'summary': f"A form for {purpose}: {_first_sentence(content, 120)}"}
+
+
+RULES = {
+    'form_relevance': form_relevance,
+    'form_batch': form_batch,
+    'form_choice': form_choice,
+    'message_field': message_field,
+    'email_list': email_list,
+    'page_summary': page_summary,
+    'form_summary': form_summary,
+}
+
+
+def answer_by_rule(name, schema, prompt):
+    rule = RULES.get(name)
+    if rule is None:
+        return default_for_schema(schema) if schema else "OK"
+    return rule(prompt)
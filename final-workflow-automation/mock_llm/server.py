@@ -0,0 +1,187 @@
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mock_llm.recordings import prompt_key
+from mock_llm.rules import answer_by_rule
+
+# Local stand-in for the OpenAI Responses API. Answers come from recorded
+# responses when the prompt was seen before, otherwise from mock_llm.rules.
+
+SETTINGS = {
+    'latency_ms': 0,
+    'jitter_ms': 0,
+    'error_rate': 0.0,
+    'rate_limit_rate': 0.0,
+}
+STATS = {
+    'requests': 0,
+    'replayed': 0,
+    'errors_injected': 0,
+    'by_schema': {},
+}
+RECORDINGS = {}
+_lock = threading.Lock()
+_random = random.Random()
+
+
+def load_recordings(path):
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                RECORDINGS[entry['key']] = entry['output_text']
+                count += 1
+            except (ValueError, KeyError):
+                continue
+    print(f"[MOCK LLM] Loaded {count} recorded responses from {path}")
+
+
+def request_prompt(request):
+    items = request.get("input")
+    if isinstance(items, str):
+        return items
+    parts = []
+    for item in items or []:
+        content = item.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(c.get("text", "") for c in content or [])
+    return "\n".join(parts)
+
+
+def response_body(model, text, prompt):
+    input_tokens = max(1, len(prompt) // 4)
+    output_tokens = max(1, len(text) // 4)
+    return {
+        'id': f"resp_{uuid.uuid4().hex}",
+        'object': "response",
+        'created_at': int(time.time()),
+        'status': "completed",
+        'model': model,
+        'output': [{
+            'type': "message",
+            'id': f"msg_{uuid.uuid4().hex}",
+            'status': "completed",
+            'role': "assistant",
+            'content': [{'type': "output_text", 'text': text, 'annotations': []}],
+        }],
+        'parallel_tool_calls': True,
+        'tool_choice': "auto",
+        'tools': [],
+        'usage': {
+            'input_tokens': input_tokens,
+            'input_tokens_details': {'cached_tokens': 0},
+            'output_tokens': output_tokens,
+            'output_tokens_details': {'reasoning_tokens': 0},
+            'total_tokens': input_tokens + output_tokens,
+        },
+    }
+
+
+def answer(request):
+    model = request.get("model", "mock")
+    prompt = request_prompt(request)
+    text_format = (request.get("text") or {}).get("format") or {}
+    schema_name = text_format.get("name", "")
+
+    with _lock:
+        STATS['requests'] += 1
+        STATS['by_schema'][schema_name or "text"] = STATS['by_schema'].get(schema_name or "text", 0) + 1
+        recorded = RECORDINGS.get(prompt_key(model, prompt, schema_name))
+        if recorded is not None:
+            STATS['replayed'] += 1
+    if recorded is not None:
+        return model, recorded, prompt
+
+    result = answer_by_rule(schema_name, text_format.get("schema"), prompt)
+    text = result if isinstance(result, str) else json.dumps(result)
+    return model, text, prompt
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _injected_error(self):
+        roll = _random.random()
+        if roll < SETTINGS['rate_limit_rate']:
+            return 429, "rate_limit_exceeded", "Rate limit reached (injected by the mock server)"
+        if roll < SETTINGS['rate_limit_rate'] + SETTINGS['error_rate']:
+            return 500, "server_error", "Internal error (injected by the mock server)"
+        return None
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            with _lock:
+                self._send_json(200, STATS)
+            return
+        self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if not self.path.rstrip("/").endswith("/responses"):
+            self.send_error(404)
+            return
+
+        delay = SETTINGS['latency_ms'] + _random.uniform(0, SETTINGS['jitter_ms'])
+        if delay:
+            time.sleep(delay / 1000)
+
+        error = self._injected_error()
+        if error:
+            with _lock:
+                STATS['errors_injected'] += 1
+            status, code, message = error
+            self._send_json(status, {'error': {'message': message, 'type': code, 'code': code}})
+            return
+
+        model, text, prompt = answer(json.loads(raw or b"{}"))
+        # Reported as "mock-<model>" so the cost ledger prices it at zero
+        self._send_json(200, response_body(f"mock-{model}", text, prompt))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_llm(port=8900, recordings=None, seed=None, **settings):
+    SETTINGS.update(settings)
+    if seed is not None:
+        _random.seed(seed)
+    if recordings:
+        load_recordings(recordings)
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockLLMHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    print(f"[MOCK LLM] Serving http://127.0.0.1:{port}/v1")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local mock of the OpenAI Responses API")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--recordings", help="JSONL of recorded responses to replay")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="share of requests answered with HTTP 429")
+    parser.add_argument("--seed", type=int, help="seed for latency jitter and error injection")
+    args = parser.parse_args()
+    start_mock_llm(args.port, recordings=args.recordings, seed=args.seed,
+                   latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                   error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate)
+    threading.Event().wait()
@@ -5,23 +5,27 @@ from urllib.parse import urljoin
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as ThreadTimeoutError
 
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 
 from utils.text_utils import extract_emails_from_text, print_debug
-from utils.browser_utils import monitor_and_kill_outlook, scroll_to_bottom, suppress_output
-from config import CHROMEDRIVER_PATH, GPT_COST_PER_1K_TOKENS
+from utils.email_ranker import rank_emails
+from utils.browser_utils import create_driver, quit_driver, monitor_and_kill_outlook, scroll_to_bottom
+from utils.text_compaction import new_compaction_state, compaction_summary
+from utils.tracing import new_timings, record_span, span
+from config import FORM_EVALUATION_MODE, DOMAIN_CRAWL_BUDGET_S
 
 from extraction.link_extraction import extract_links, is_relevant_link
 from extraction.page_extraction import extract_text_from_page, nested_subpage_recovery
-from gpt.form_selector import process_detected_forms
+from gpt.form_selector import process_detected_forms, dispatch_form_evaluation, join_form_verdicts
+from gpt.ledger import new_token_usage
 from extraction.form_extraction import parse_form_fields
 from form_submit.utils import form_is_fillable
 
 
 def process_domain(domain_url):
     detected_forms_dict = {}
+    pending_verdicts = {}
+    # Boilerplate blocks already seen on this domain
+    compaction = new_compaction_state()
 
     log = {
         'domain': domain_url,
@@ -29,32 +33,78 @@ def process_domain(domain_url):
             'method_used': None,
             'emails_found': [],
         },
-        'token_usage': {
-            'tokens_used': 0,
-            'summarize_calls': 0,
-            'estimated_cost_usd': 0.0
-        },
+        'token_usage': new_token_usage(),
         'used_recovery': False,
         'timed_out': False,
         'form_detected': False,
         'form_page_urls': [],
-        'chosen_form': {}
+        'chosen_form': {},
+        'timings': new_timings(),
     }
 
     start_time = time.time()
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--log-level=3")
-    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    with span(log, "chrome_start"):
+        driver = create_driver(domain_url)
+
+    try:
+        page_texts = crawl_pages(driver, domain_url, log, start_time, compaction,
+                                 detected_forms_dict, pending_verdicts)
+    finally:
+        # Also runs when the crawl raises, so no Chrome is left behind
+        quit_driver(driver)
+    log['text_compaction'] = compaction_summary(compaction)
+
+    if page_texts:
+        combined_text = "\n\n".join(page_texts.values())
+
+        # === TOGGLE BETWEEN METHODS HERE ===
+        # Default: use manual NLP method
+        email_method = 'NLP'
+        with span(log, "email_extraction"):
+            extracted_emails, email_scores = rank_emails(
+                extract_emails_from_text(combined_text), domain_url, combined_text)
+
+        # Optional: switch to GPT-based method by uncommenting:
+        # email_method = 'gpt'
+        # extracted_emails = extract_emails_using_gpt_combined(page_texts, log)
+        # email_scores = {}
+
+        log['email_extraction'] = {
+            'method_used': email_method,
+            'emails_found': extracted_emails,
+            'email_scores': email_scores,
+        }
+
+    else:
+        log['timed_out'] = True
+
+    if FORM_EVALUATION_MODE == "per_form":
+        with span(log, "form_verdict_wait"):
+            join_form_verdicts(detected_forms_dict, pending_verdicts)
+
+    # Selection drops the candidates that GPT did not judge relevant.
+    # Its span includes the GPT calls and the form submission.
+    with span(log, "form_selection"):
+        chosen_form = process_detected_forms(log, detected_forms_dict)
+
+    log['form_detected'] = len(detected_forms_dict) > 0
+    log['form_page_urls'] = [value[2]
+                             for value in detected_forms_dict.values()]
+
+    if chosen_form:
+        log['chosen_form'] = chosen_form
+
+    record_span(log, "domain_total", time.time() - start_time, start_time)
+    return log
 
-    with suppress_output():
-        driver = webdriver.Chrome(service=Service(
-            CHROMEDRIVER_PATH), options=options)
 
-    driver.get(domain_url)
-    time.sleep(3)
+def crawl_pages(driver, domain_url, log, start_time, compaction,
+                detected_forms_dict, pending_verdicts):
+    with span(log, "homepage_load"):
+        driver.get(domain_url)
+        time.sleep(3)
 
+    link_start = time.time()
     raw_links = extract_links(driver, restrict_to_header_footer=True)
     found_links = {}
     seen_urls = set()
@@ -81,29 +131,38 @@ def process_domain(domain_url):
             if is_relevant_link(text):
                 found_links[text] = abs_url
                 seen_urls.add(abs_url)
+    record_span(log, "link_extraction", time.time() - link_start, link_start)
 
     page_texts = {}
 
     for i, (page_name, page_url) in enumerate(found_links.items()):
-        if time.time() - start_time > 240:
+        if time.time() - start_time > DOMAIN_CRAWL_BUDGET_S:
             log['timed_out'] = True
             print(f"[TIME LIMIT] Partial scrape used for {domain_url}.")
             break
         try:
-            driver.get(page_url)
-            scroll_to_bottom(driver)
-            text, extracted_forms = extract_text_from_page(
-                driver, i + 1, page_url, log)
+            with span(log, "page_load"):
+                driver.get(page_url)
+            with span(log, "scroll"):
+                scroll_to_bottom(driver)
+            with span(log, "parse"):
+                text, extracted_forms = extract_text_from_page(
+                    driver, i + 1, page_url, log, compaction)
             if text.strip():
                 page_texts[page_name] = text
             form_index = len(detected_forms_dict) + 1
             for form in extracted_forms.values():
                 html, text, url = form
-                parsed_fields = parse_form_fields(html)
+                with span(log, "form_check"):
+                    parsed_fields = parse_form_fields(html)
 
                 if form_is_fillable(parsed_fields):
                     detected_forms_dict[form_index] = (html, text, url)
                     print(f"[DEBUG] Added form {form_index} — fillable")
+                    if FORM_EVALUATION_MODE == "per_form":
+                        # GPT judges the form while the crawler moves on
+                        pending_verdicts[form_index] = dispatch_form_evaluation(
+                            text, url, log)
                     form_index += 1
                 else:
                     print(
@@ -111,42 +170,9 @@ def process_domain(domain_url):
         except:
             continue
 
-    log['form_detected'] = len(detected_forms_dict) > 0
-    log['form_page_urls'] = [url for _,
-                             (_, _, url) in detected_forms_dict.items()]
-
     if not page_texts:
-        page_texts = nested_subpage_recovery(driver, domain_url, log)
-
-    driver.quit()
-
-    if page_texts:
-        combined_text = "\n\n".join(page_texts.values())
-
-        # === TOGGLE BETWEEN METHODS HERE ===
-        # Default: use manual NLP method
-        email_method = 'NLP'
-        extracted_emails = extract_emails_from_text(combined_text)
-
-        # Optional: switch to GPT-based method by uncommenting:
-        # email_method = 'gpt'
-        # extracted_emails = extract_emails_using_gpt_combined(page_texts, log)
+        with span(log, "recovery"):
+            page_texts = nested_subpage_recovery(
+                driver, domain_url, log, compaction)
 
-        log['email_extraction'] = {
-            'method_used': email_method,
-            'emails_found': extracted_emails,
-        }
-
-    else:
-        log['timed_out'] = True
-
-    log['token_usage']['estimated_cost_usd'] = round(
-        (log['token_usage']['tokens_used'] / 1000) * GPT_COST_PER_1K_TOKENS, 5
-    )
-
-    chosen_form = process_detected_forms(log, detected_forms_dict)
-
-    if chosen_form:
-        log['chosen_form'] = chosen_form
-
-    return log
+    return page_texts
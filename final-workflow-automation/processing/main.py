@@ -1,71 +1,187 @@
+import argparse
 import os
-import json
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as ThreadTimeoutError
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from utils.text_utils import print_debug
 from utils.browser_utils import monitor_and_kill_outlook
-from config import LOGS_DIR_PATH, DOMAINS_TXT_PATH
+from utils.browser_watchdog import browser_owner, kill_browsers, start_watchdog, write_watchdog_report
+from config import DOMAINS_TXT_PATH, DOMAIN_URL_SCHEME, DOMAIN_WORKERS, DOMAIN_TIMEOUT_S, PROFILES_DIR_PATH, PROFILE_THRESHOLD_S, PROFILE_SAMPLE_INTERVAL_S
 from processing.domain_processor import process_domain
-from utils.report_utils import generate_summary_csv
+from utils.report_utils import generate_summary_csv, start_summary_csv, append_summary_row
+from utils.progress import new_progress, update_progress, report_progress
+from gpt.ledger import new_token_usage, write_run_ledger
+from form_submit.captcha import write_captcha_ledger
+from utils.domain_cache import get_cached_result, put_cached_result
+from utils.results_store import append_result, close_results_store, iter_results
+from utils.tracing import write_timing_report
+from utils.profiling import finish_profile, profile_call
+from resources import get_logs_dir
 
 
-def main():
+def progress_path():
+    return os.path.join(get_logs_dir(), "progress.json")
+
+
+def save_domain_log(domain, log, progress):
+    # The final log (includes form submission log if applicable)
+    append_result(domain, log)
+    append_summary_row(domain, log)
+    print_debug(f"{domain} completed and log saved.")
+    update_progress(progress, log)
+    report_progress(progress, progress_path())
+
+
+def run_domain(domain, profile, profile_threshold, profile_sessions=None):
+    with browser_owner(domain):
+        return _run_domain(domain, profile, profile_threshold, profile_sessions)
+
+
+def _run_domain(domain, profile, profile_threshold, profile_sessions=None):
+    url = f"{DOMAIN_URL_SCHEME}://{domain}"
+    if not profile:
+        return process_domain(url)
+
+    log, profile_info = profile_call(
+        lambda: process_domain(url),
+        domain.replace('.', '_'),
+        PROFILES_DIR_PATH,
+        threshold_s=profile_threshold,
+        interval_s=PROFILE_SAMPLE_INTERVAL_S,
+        sessions=profile_sessions,
+    )
+    if profile_info:
+        log['profile'] = profile_info
+    return log
+
+
+def timed_out_log(domain):
+    return {
+        'domain': domain,
+        'email_extraction': {
+            'method_used': 'NLP',
+            'emails_found': [],
+        },
+        'token_usage': new_token_usage(),
+        'used_recovery': False,
+        'timed_out': True,
+        'form_detected': False,
+        'form_page_urls': [],
+        'chosen_form': {},
+        'form_submission_log': {
+            'url': '',
+            'filled_fields': [],
+            'submit_clicked': False,
+            'captcha_present': False,
+            'captcha_solved': False,
+            'captcha_fallback_used': False,
+            'captcha_error': '',
+            'errors': []
+        }
+    }
+
+
+def crawl_domain(domain, profile, profile_threshold):
+    monitor_and_kill_outlook()
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    profile_sessions = []
+    try:
+        future = executor.submit(
+            run_domain, domain, profile, profile_threshold, profile_sessions)
+        return future.result(timeout=DOMAIN_TIMEOUT_S)
+    except TimeoutError:
+        log = timed_out_log(domain)
+        # Dump the profile now: the slow domains are the ones worth keeping,
+        # and the abandoned thread may never get back to it
+        for session in profile_sessions:
+            log['profile'] = finish_profile(session, PROFILES_DIR_PATH, status="timed_out")
+        # Killing its browsers makes the abandoned crawl fail fast
+        # instead of holding a Chrome until it finishes on its own
+        kill_browsers(domain)
+        print_debug(f"[TIMEOUT] Skipped {domain} after full limit.")
+        return log
+    finally:
+        executor.shutdown(wait=False)
+
+
+def main(profile=False, profile_threshold=PROFILE_THRESHOLD_S, domains_path=DOMAINS_TXT_PATH,
+         workers=DOMAIN_WORKERS):
     print_debug("Starting scraping process")
 
     # Read domain list from txt file
-    with open(DOMAINS_TXT_PATH, "r", encoding="utf-8") as f:
+    with open(domains_path, "r", encoding="utf-8") as f:
         domains = [line.strip() for line in f if line.strip()]
 
+    if profile and workers > 1:
+        # cProfile can only run one profiler at a time on Python 3.12+
+        # (sys.monitoring is process-wide), and concurrent domains would skew
+        # each other's timings anyway
+        print_debug(f"[PROFILE] --profile crawls one domain at a time; ignoring workers={workers}")
+        workers = 1
+
+    progress = new_progress(len(domains))
+    start_summary_csv()
+    start_watchdog()
+
+    to_crawl = []
     for domain in domains:
-        print_debug(f"Processing domain: {domain}")
-        monitor_and_kill_outlook()
-
-        try:
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(process_domain, "https://" + domain)
-                log = future.result(timeout=300)
-        except TimeoutError:
+        cached = get_cached_result(domain)
+        if cached:
+            # Reuse the stored result; nothing is spent on this domain again
             log = {
-                'domain': domain,
-                'email_extraction': {
-                    'method_used': 'NLP',
-                    'emails_found': [],
-                },
-                'token_usage': {
-                    'tokens_used': 0,
-                    'summarize_calls': 0,
-                    'estimated_cost_usd': 0
-                },
-                'used_recovery': False,
-                'timed_out': True,
-                'form_detected': False,
-                'form_page_urls': [],
-                'chosen_form': {},
-                'form_submission_log': {
-                    'url': '',
-                    'filled_fields': [],
-                    'submit_clicked': False,
-                    'captcha_present': False,
-                    'captcha_solved': False,
-                    'captcha_fallback_used': False,
-                    'captcha_error': '',
-                    'errors': []
-                }
+                **cached['log'],
+                'token_usage': new_token_usage(),
+                'cache_hit': True,
+                'cached_at': time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(cached['cached_at'])),
             }
-            print_debug(f"[TIMEOUT] Skipped {domain} after full limit.")
-        except Exception as e:
-            print_debug(f"[ERROR] Failed to process {domain}: {e}")
+            print_debug(f"[CACHE HIT] {domain} resolved on {log['cached_at']}")
+            save_domain_log(domain, log, progress)
             continue
+        to_crawl.append(domain)
+
+    # Domains are crawled by `workers` threads, each with its own browser.
+    # Results are saved here, on the main thread, as they finish.
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {}
+        for domain in to_crawl:
+            print_debug(f"Processing domain: {domain}")
+            futures[executor.submit(crawl_domain, domain, profile, profile_threshold)] = domain
+
+        for future in as_completed(futures):
+            domain = futures[future]
+            try:
+                log = future.result()
+            except Exception as e:
+                print_debug(f"[ERROR] Failed to process {domain}: {e}")
+                update_progress(progress)
+                report_progress(progress, progress_path())
+                continue
 
-        # Write the final log to file (includes form submission log if applicable)
-        log_path = os.path.join(
-            LOGS_DIR_PATH, f"{domain.replace('.', '_')}.json")
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(log, f, indent=2)
-            print_debug(f"{domain} completed and log saved.")
+            log['cache_hit'] = False
+            put_cached_result(domain, log)
+            save_domain_log(domain, log, progress)
 
     print_debug("Scraping completed for all domains")
     generate_summary_csv()
+    write_timing_report(
+        (result['log'] for result in iter_results(with_log=True)
+         if not result['cache_hit']),
+        os.path.join(get_logs_dir(), "timing_report.json"))
+    close_results_store()
+    write_run_ledger(os.path.join(get_logs_dir(), "gpt_ledger.json"))
+    write_watchdog_report(os.path.join(get_logs_dir(), "browser_watchdog.json"))
+    write_captcha_ledger(os.path.join(get_logs_dir(), "captcha_ledger.json"))
 
 
-main()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the scraping pipeline")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile each domain with cProfile and a stack sampler")
+    parser.add_argument("--profile-threshold", type=float, default=PROFILE_THRESHOLD_S,
+                        help="only keep profiles of domains slower than this many seconds")
+    parser.add_argument("--workers", type=int, default=DOMAIN_WORKERS,
+                        help="domains crawled at the same time")
+    args = parser.parse_args()
+    main(profile=args.profile, profile_threshold=args.profile_threshold, workers=args.workers)
@@ -0,0 +1,45 @@
+import os
+import threading
+
+from config import LOGS_DIR_PATH, OPENAI_API_KEY, SPACY_MODEL
+
+# Expensive or side-effecting resources, created once on first use so that
+# importing config (reports, checkers, benchmarks) stays fast.
+
+_resources = {}
+_lock = threading.Lock()
+
+
+def _get(name, factory):
+    if name not in _resources:
+        with _lock:
+            if name not in _resources:
+                _resources[name] = factory()
+    return _resources[name]
+
+
+def _load_nlp():
+    import spacy
+    return spacy.load(SPACY_MODEL)
+
+
+def _create_openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+
+def _create_logs_dir():
+    os.makedirs(LOGS_DIR_PATH, exist_ok=True)
+    return LOGS_DIR_PATH
+
+
+def get_nlp():
+    return _get('nlp', _load_nlp)
+
+
+def get_openai_client():
+    return _get('openai_client', _create_openai_client)
+
+
+def get_logs_dir():
+    return _get('logs_dir', _create_logs_dir)
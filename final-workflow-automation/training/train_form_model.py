@@ -0,0 +1,391 @@
+import argparse
+import csv
+import json
+import re
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from config import BASE_DIR, DATA_DIR, FORM_MODEL_PATH, FORM_MODEL_THRESHOLD
+from extraction.form_compactor import compact_form
+from extraction.form_extraction import parse_form_fields
+from extraction.form_model import predict_form_relevance
+from utils.results_store import iter_results
+
+REPO_DIR = BASE_DIR.parent
+HTML_CODES_DIR = REPO_DIR / "auto-form-filler" / "html-codes"
+FORM_URLS_PATH = REPO_DIR / "auto-form-filler" / "detected_form_urls.txt"
+FORM_LOGS_DIR = REPO_DIR / "auto-form-filler" / "form-logs"
+# Logs of the forms the old GPT pipeline accepted and picked, one per domain
+CHOSEN_FORM_LOG_DIRS = [REPO_DIR / "auto-form-filler" / "logs" / "fillable-forms",
+                        REPO_DIR / "auto-form-filler" / "logs" / "unfilled-forms"]
+FORM_EXAMPLES_PATH = REPO_DIR / "other" / "docs" / "text-files" / "forms-html-examples.txt"
+GROUND_TRUTH_PATH = REPO_DIR / "other" / "data" / "domains.csv"
+LABELS_PATH = Path(__file__).resolve().parent / "form_labels.csv"
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+RUN_LOGS_DIR = DATA_DIR / "logs"
+
+AD_URL_PATTERN = re.compile(r"advertis|sponsor|media-?kit|partner")
+# Hand-checked labels; "gpt" and "url" labels are only weak ones
+GOLD_LABEL_SOURCES = ("manual", "ground_truth")
+
+
+def _slug(host):
+    return re.sub(r"[^a-z0-9-]", "_", host.lower())
+
+
+def _host(url):
+    return re.sub(r"^https?://", "", url).split("/")[0].lower()
+
+
+def load_ground_truth():
+    truth = {}
+    with open(GROUND_TRUTH_PATH, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            domain = (row.get("domain") or "").strip().lower()
+            if domain:
+                truth[domain] = (row.get("email/form") or "").strip().strip('"')
+    return truth
+
+
+def load_manual_labels():
+    if not LABELS_PATH.exists():
+        return {}
+    with open(LABELS_PATH, "r", encoding="utf-8") as f:
+        return {row["source"]: int(row["label"]) for row in csv.DictReader(f)}
+
+
+def load_form_urls():
+    # source -> page URL, from the detected URL list and the fill logs
+    form_urls = {}
+    with open(FORM_URLS_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            url = line.strip()
+            if url:
+                form_urls.setdefault(_slug(_host(url)), url)
+    for path in sorted(FORM_LOGS_DIR.glob("*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                url = json.load(f).get("url") or ""
+        except Exception:
+            continue
+        if url:
+            form_urls.setdefault(_slug(_host(url)), url)
+    return form_urls
+
+
+def load_chosen_forms():
+    chosen = set()
+    for directory in CHOSEN_FORM_LOG_DIRS:
+        for path in directory.glob("*_final_chosen_form.json"):
+            chosen.add(path.name.replace("_final_chosen_form.json", ""))
+    return chosen
+
+
+def load_examples():
+    # The saved forms of the old pipeline. Only forms GPT accepted were
+    # saved, so their recorded verdict is always "relevant".
+    form_urls = load_form_urls()
+    chosen = load_chosen_forms()
+
+    examples = []
+    for path in sorted(HTML_CODES_DIR.glob("*_final_chosen_form.html")):
+        source = path.name.replace("_final_chosen_form.html", "")
+        examples.append({
+            'source': source,
+            'url': form_urls.get(source, ""),
+            'html': path.read_text(encoding="utf-8", errors="ignore"),
+            'gpt': 1 if source in chosen else None,
+        })
+
+    seen = {e['source'] for e in examples}
+    text = FORM_EXAMPLES_PATH.read_text(encoding="utf-8", errors="ignore")
+    for url, html in re.findall(
+            r"The website: (\S+) contains the following form:\n(.*?)(?=\nThe website: |\Z)", text, re.S):
+        source = _slug(_host(url))
+        if source not in seen:
+            seen.add(source)
+            examples.append({'source': source, 'url': url, 'html': html, 'gpt': None})
+
+    return examples
+
+
+def _run_logs():
+    # Domain logs of past runs: results.sqlite rows and per-domain JSON files
+    for path in sorted(RUN_LOGS_DIR.glob("run_*/results.sqlite")):
+        for result in iter_results(path, with_log=True):
+            yield result['log']
+    for path in sorted(RUN_LOGS_DIR.glob("run_*/*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                log = json.load(f)
+        except Exception:
+            continue
+        if isinstance(log, dict) and 'domain' in log:
+            yield log
+
+
+def load_logged_verdicts():
+    # GPT verdicts the crawler recorded next to the exact schema it judged,
+    # so these examples are what the model scores at inference
+    examples, seen = [], set()
+    for log in _run_logs():
+        for verdict in log.get('form_verdicts', []):
+            if verdict['schema'] in seen:
+                continue
+            seen.add(verdict['schema'])
+            examples.append({
+                'source': _slug(_host(verdict['url'])) if verdict['url'] else "",
+                'url': verdict['url'],
+                'schema': verdict['schema'],
+                'context': "logged",
+                'gpt': int(verdict['relevant']),
+            })
+    return examples
+
+
+def label_example(example, manual_labels, ground_truth):
+    # Manual review first, then the linkbuilder ground truth, then GPT's
+    # logged verdict, then the page URL as a weak label. Manual labels and a
+    # bare "form" ground truth describe the one saved form of a domain, so
+    # they are not applied to every form a crawl logged for it.
+    logged = example.get('context') == "logged"
+    if not logged and example['source'] in manual_labels:
+        return manual_labels[example['source']], "manual"
+
+    host = _host(example['url']).removeprefix("www.") if example['url'] else ""
+    for domain, expected in ground_truth.items():
+        if host and (host == domain or host.endswith("." + domain)):
+            if expected.startswith("http"):
+                if expected.rstrip("/") == example['url'].rstrip("/"):
+                    return 1, "ground_truth"
+            elif expected.lower() == "form" and not logged:
+                return 1, "ground_truth"
+            break
+
+    if logged:
+        return example['gpt'], "gpt"
+    if AD_URL_PATTERN.search(example['url'].lower()):
+        return 1, "url"
+    return 0, "url"
+
+
+def page_path(source):
+    return PAGES_DIR / f"{source}.html"
+
+
+def fetch_pages(examples):
+    # Saves the page each saved form came from, so its schema gets the page
+    # title, headings and nearby text the crawler sees. Plain HTTP, not
+    # Chrome: forms rendered by JavaScript fall back to the form alone.
+    import urllib.request
+
+    PAGES_DIR.mkdir(parents=True, exist_ok=True)
+    for example in examples:
+        path = page_path(example['source'])
+        if not example['url'] or path.exists():
+            continue
+        request = urllib.request.Request(example['url'], headers={"User-Agent": "Mozilla/5.0"})
+        try:
+            with urllib.request.urlopen(request, timeout=20) as response:
+                path.write_bytes(response.read())
+            print(f"[TRAIN] Fetched {example['url']}")
+        except Exception as e:
+            print(f"[WARN] Could not fetch {example['url']}: {e}")
+
+
+def _field_names(form):
+    return {tag.get("name") or tag.get("id")
+            for tag in form.find_all(["input", "textarea", "select"])} - {None, ""}
+
+
+def example_schema(example):
+    # The crawler's own compact_form(form, page_soup, ...) call: with the
+    # fetched page when there is one, else with the saved form alone
+    form_soup = BeautifulSoup(example['html'], "html.parser")
+    form = form_soup.find("form") or form_soup
+    path = page_path(example['source'])
+    if path.exists():
+        page = BeautifulSoup(path.read_text(encoding="utf-8", errors="ignore"), "html.parser")
+        names = _field_names(form)
+        match = max(page.find_all("form"), key=lambda f: len(names & _field_names(f)), default=None)
+        if match is not None and names & _field_names(match):
+            return compact_form(match, page, parse_form_fields(str(match))), "page"
+    return compact_form(form, form_soup, parse_form_fields(str(form))), "form_only"
+
+
+def export_model(vectorizer, classifier, path):
+    vocabulary = {term: int(index)
+                  for term, index in vectorizer.vocabulary_.items()}
+    model = {
+        'trained_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'ngram_range': list(vectorizer.ngram_range),
+        'sublinear_tf': vectorizer.sublinear_tf,
+        'vocabulary': vocabulary,
+        'idf': [round(float(v), 6) for v in vectorizer.idf_],
+        'coef': [round(float(v), 6) for v in classifier.coef_[0]],
+        'intercept': float(classifier.intercept_[0]),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(model, f)
+    return model
+
+
+def binary_metrics(labels, predictions):
+    tp = sum(1 for y, p in zip(labels, predictions) if y and p)
+    fp = sum(1 for y, p in zip(labels, predictions) if not y and p)
+    fn = sum(1 for y, p in zip(labels, predictions) if y and not p)
+    correct = sum(1 for y, p in zip(labels, predictions) if y == p)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        'accuracy': round(correct / len(labels), 3) if labels else 0.0,
+        'precision': round(precision, 3),
+        'recall': round(recall, 3),
+        'f1': round(f1, 3),
+    }
+
+
+def gpt_call_stats():
+    # Average latency and cost of real relevance calls from past run ledgers
+    calls, latency, cost = 0, 0.0, 0.0
+    for path in RUN_LOGS_DIR.glob("run_*/gpt_ledger.json"):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                by_purpose = json.load(f).get("by_purpose", {})
+        except Exception:
+            continue
+        for purpose in ("form_relevance", "form_batch"):
+            rollup = by_purpose.get(purpose)
+            if rollup:
+                calls += rollup['calls']
+                latency += rollup['latency_s']
+                cost += rollup['cost_usd']
+    if not calls:
+        return None
+    return {
+        'calls': calls,
+        'mean_latency_ms': round(latency / calls * 1000, 1),
+        'mean_cost_usd': round(cost / calls, 6),
+    }
+
+
+def _subset_metrics(labels, predictions, keep):
+    pairs = [(y, p) for y, p, k in zip(labels, predictions, keep) if k]
+    if not pairs:
+        return None
+    return {'examples': len(pairs), **binary_metrics(*zip(*pairs))}
+
+
+def train(output_path=FORM_MODEL_PATH, folds=5, fetch=False):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import StratifiedKFold
+
+    manual_labels = load_manual_labels()
+    ground_truth = load_ground_truth()
+    examples = load_examples()
+    if fetch:
+        fetch_pages(examples)
+    for example in examples:
+        example['schema'], example['context'] = example_schema(example)
+    examples += load_logged_verdicts()
+
+    texts, labels, sources = [], [], []
+    for example in examples:
+        label, source = label_example(example, manual_labels, ground_truth)
+        texts.append(example['schema'])
+        labels.append(label)
+        sources.append(source)
+    contexts = [example['context'] for example in examples]
+    gpt_verdicts = [example['gpt'] for example in examples]
+
+    positives = sum(labels)
+    print(f"[TRAIN] {len(examples)} forms, {positives} relevant, "
+          f"{len(labels) - positives} not relevant")
+    if positives == 0 or positives == len(labels):
+        raise SystemExit("[ERROR] Training data needs both classes.")
+
+    def build():
+        return (TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True),
+                LogisticRegression(class_weight="balanced", C=4.0, max_iter=1000))
+
+    # Cross-validated predictions give an honest score on this small corpus
+    folds = max(2, min(folds, positives, len(labels) - positives))
+    cv_predictions = [0] * len(labels)
+    for train_idx, test_idx in StratifiedKFold(n_splits=folds, shuffle=True, random_state=7).split(texts, labels):
+        vectorizer, classifier = build()
+        matrix = vectorizer.fit_transform([texts[i] for i in train_idx])
+        classifier.fit(matrix, [labels[i] for i in train_idx])
+        probabilities = classifier.predict_proba(
+            vectorizer.transform([texts[i] for i in test_idx]))[:, 1]
+        for i, probability in zip(test_idx, probabilities):
+            cv_predictions[i] = int(probability >= FORM_MODEL_THRESHOLD)
+
+    vectorizer, classifier = build()
+    classifier.fit(vectorizer.fit_transform(texts), labels)
+    model = export_model(vectorizer, classifier, Path(output_path))
+
+    start = time.perf_counter()
+    for text in texts:
+        predict_form_relevance(text, model)
+    mean_us = (time.perf_counter() - start) / len(texts) * 1_000_000
+
+    # Weak labels mostly restate the URL regex, so both the model and GPT are
+    # scored on the hand-checked labels; GPT only where a verdict was recorded
+    gold = [source in GOLD_LABEL_SOURCES for source in sources]
+    judged = [verdict is not None for verdict in gpt_verdicts]
+    gpt_predictions = [verdict or 0 for verdict in gpt_verdicts]
+    report = {
+        'examples': len(labels),
+        'relevant': positives,
+        'label_sources': {s: sources.count(s) for s in sorted(set(sources))},
+        'schema_contexts': {c: contexts.count(c) for c in sorted(set(contexts))},
+        'folds': folds,
+        'threshold': FORM_MODEL_THRESHOLD,
+        'model': {
+            **binary_metrics(labels, cv_predictions),
+            'mean_inference_us': round(mean_us, 1),
+        },
+        'model_on_gold_labels': _subset_metrics(labels, cv_predictions, gold),
+        'gpt_on_gold_labels': _subset_metrics(
+            labels, gpt_predictions, [g and j for g, j in zip(gold, judged)]),
+        'model_vs_gpt': _subset_metrics(gpt_predictions, cv_predictions, judged),
+        'gpt_verdicts': {
+            'saved_forms': sum(1 for e in examples if e['context'] != "logged" and e['gpt'] is not None),
+            'logged': contexts.count("logged"),
+        },
+        'gpt_calls': gpt_call_stats(),
+        'disagreements': [
+            {'source': e['source'], 'url': e['url'], 'context': e['context'],
+             'label': y, 'label_source': s, 'model': p, 'gpt': e['gpt']}
+            for e, y, s, p in zip(examples, labels, sources, cv_predictions) if y != p
+        ],
+    }
+
+    report_path = Path(output_path).with_name(
+        Path(output_path).stem + "_report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"[TRAIN] Model written to {output_path}")
+    print(f"[TRAIN] Model (cross-validated): {report['model']}")
+    print(f"[TRAIN] Model on gold labels: {report['model_on_gold_labels']}")
+    print(f"[TRAIN] GPT on gold labels: {report['gpt_on_gold_labels']}")
+    print(f"[TRAIN] Model vs GPT verdicts: {report['model_vs_gpt']}")
+    print(f"[TRAIN] Report written to {report_path}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Train the offline form relevance model")
+    parser.add_argument("--output", default=str(FORM_MODEL_PATH))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--fetch-pages", action="store_true",
+                        help="download the pages of the saved forms into training/pages first")
+    args = parser.parse_args()
+    train(args.output, args.folds, args.fetch_pages)
@@ -1,7 +1,12 @@
 import time
-import os
+import subprocess
 import psutil
-import contextlib
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+from config import CHROMEDRIVER_PATH
+from utils.browser_watchdog import register_browser, release_browser
 
 
 def monitor_and_kill_outlook():
@@ -11,6 +16,30 @@ def monitor_and_kill_outlook():
             proc.kill()
 
 
+def create_driver(label=""):
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--log-level=3")
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+
+    # chromedriver's own chatter goes to devnull through its Service; swapping
+    # sys.stdout/stderr instead is process-wide and races the other workers
+    service = Service(CHROMEDRIVER_PATH, log_output=subprocess.DEVNULL)
+    driver = webdriver.Chrome(service=service, options=options)
+    register_browser(driver, label)
+    return driver
+
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"[WARN] driver.quit() failed: {e}")
+    # Kills whatever Chrome processes quit() left behind
+    release_browser(driver)
+
+
 def scroll_to_bottom(driver, timeout=60):
     start_time = time.time()
     last_height = driver.execute_script("return document.body.scrollHeight")
@@ -28,10 +57,3 @@ def scroll_to_bottom(driver, timeout=60):
         if time.time() - start_time > timeout:
             print("[WARN] Scrolling timeout exceeded. Proceeding with partial content.")
             break
-
-
-@contextlib.contextmanager
-def suppress_output():
-    with open(os.devnull, "w") as fnull:
-        with contextlib.redirect_stdout(fnull), contextlib.redirect_stderr(fnull):
-            yield
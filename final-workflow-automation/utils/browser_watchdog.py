@@ -0,0 +1,219 @@
+import contextlib
+import json
+import threading
+import time
+
+import psutil
+
+from config import BROWSER_RSS_CAP_MB, BROWSER_WATCHDOG_INTERVAL_S
+
+# Every chromedriver we start is registered here with the Chrome processes
+# below it. A background thread kills browsers whose process tree grows past
+# the RSS cap and reaps processes that outlive their driver (a crash before
+# driver.quit(), a domain abandoned after its timeout).
+
+# psutil.Process objects are kept rather than pids: they notice pid reuse,
+# so a recycled pid is never killed by mistake.
+_browsers = {}  # chromedriver pid -> browser entry
+_orphans = {}  # pid -> process left behind by a finished browser
+_stats = {
+    'browsers_started': 0,
+    'browsers_quit': 0,
+    'killed_over_cap': 0,
+    'killed_by_owner': 0,
+    'orphans_reaped': 0,
+    'reclaimed_mb': 0.0,
+    'peak_rss_mb': 0.0,
+}
+_owner = threading.local()
+_lock = threading.Lock()
+_stop = threading.Event()
+_thread = None
+
+
+@contextlib.contextmanager
+def browser_owner(name):
+    # Browsers created inside this block can be killed together by name
+    previous = getattr(_owner, 'name', None)
+    _owner.name = name
+    try:
+        yield
+    finally:
+        _owner.name = previous
+
+
+def _tree(root):
+    try:
+        if not root.is_running():
+            return []
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def _alive(processes):
+    return [proc for proc in processes if proc.is_running()]
+
+
+def _rss_mb(processes):
+    total = 0
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / 1024 / 1024
+
+
+def _kill(processes):
+    reclaimed = _rss_mb(processes)
+    for proc in processes:
+        try:
+            proc.kill()
+        except psutil.Error:
+            continue
+    psutil.wait_procs(processes, timeout=5)
+    return reclaimed
+
+
+def register_browser(driver, label=""):
+    pid = driver.service.process.pid
+    root = psutil.Process(pid)
+    with _lock:
+        _browsers[pid] = {
+            'label': label,
+            'owner': getattr(_owner, 'name', None),
+            'started_at': time.time(),
+            'root': root,
+            'processes': {proc.pid: proc for proc in _tree(root)},
+        }
+        _stats['browsers_started'] += 1
+    return pid
+
+
+def release_browser(driver):
+    # Called after driver.quit(); anything still alive in the tree is killed
+    pid = driver.service.process.pid if driver.service.process else None
+    with _lock:
+        entry = _browsers.pop(pid, None)
+        _stats['browsers_quit'] += 1
+    if entry:
+        leftovers = _alive({**entry['processes'],
+                            **{proc.pid: proc for proc in _tree(entry['root'])}}.values())
+        if leftovers:
+            reclaimed = _kill(leftovers)
+            with _lock:
+                _stats['orphans_reaped'] += len(leftovers)
+                _stats['reclaimed_mb'] += reclaimed
+
+
+def kill_browsers(owner):
+    # e.g. the browsers of a domain that ran past its timeout
+    with _lock:
+        pids = [pid for pid, entry in _browsers.items() if entry['owner'] == owner]
+        entries = [_browsers.pop(pid) for pid in pids]
+    reclaimed = 0.0
+    for pid, entry in zip(pids, entries):
+        tree = {**entry['processes'], **{proc.pid: proc for proc in _tree(entry['root'])}}
+        reclaimed += _kill(_alive(tree.values()))
+        print(f"[WATCHDOG] Killed browser {pid} of {owner}")
+    with _lock:
+        _stats['killed_by_owner'] += len(pids)
+        _stats['reclaimed_mb'] += reclaimed
+    return len(pids)
+
+
+def check_browsers(rss_cap_mb=BROWSER_RSS_CAP_MB):
+    with _lock:
+        browsers = list(_browsers.items())
+
+    total_rss = 0.0
+    for pid, entry in browsers:
+        tree = _tree(entry['root'])
+        if not tree:
+            # chromedriver died on its own; its Chrome children may not have
+            with _lock:
+                _browsers.pop(pid, None)
+                _orphans.update(entry['processes'])
+            continue
+        with _lock:
+            entry['processes'].update((proc.pid, proc) for proc in tree)
+        rss = _rss_mb(tree)
+        total_rss += rss
+        if rss_cap_mb and rss > rss_cap_mb:
+            print(f"[WATCHDOG] Browser {pid} ({entry['label']}) uses {rss:.0f} MB "
+                  f"> {rss_cap_mb:.0f} MB cap — killing it.")
+            with _lock:
+                _browsers.pop(pid, None)
+            reclaimed = _kill(tree)
+            with _lock:
+                _stats['killed_over_cap'] += 1
+                _stats['reclaimed_mb'] += reclaimed
+
+    with _lock:
+        _stats['peak_rss_mb'] = max(_stats['peak_rss_mb'], total_rss)
+        orphans = _alive(_orphans.values())
+        _orphans.clear()
+    if orphans:
+        reclaimed = _kill(orphans)
+        with _lock:
+            _stats['orphans_reaped'] += len(orphans)
+            _stats['reclaimed_mb'] += reclaimed
+        print(f"[WATCHDOG] Reaped {len(orphans)} orphaned browser processes ({reclaimed:.0f} MB)")
+    return total_rss
+
+
+def _watch(interval_s, rss_cap_mb):
+    while not _stop.wait(interval_s):
+        try:
+            check_browsers(rss_cap_mb)
+        except Exception as e:
+            print(f"[WATCHDOG] Check failed: {e}")
+
+
+def start_watchdog(interval_s=BROWSER_WATCHDOG_INTERVAL_S, rss_cap_mb=BROWSER_RSS_CAP_MB):
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return _thread
+    _stop.clear()
+    _thread = threading.Thread(target=_watch, args=(interval_s, rss_cap_mb),
+                               name="browser-watchdog", daemon=True)
+    _thread.start()
+    return _thread
+
+
+def stop_watchdog():
+    # Final sweep: nothing we started survives the run
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join()
+        _thread = None
+    with _lock:
+        leftover = list(_browsers.values())
+        _browsers.clear()
+    for entry in leftover:
+        _orphans.update(entry['processes'])
+        _orphans.update((proc.pid, proc) for proc in _tree(entry['root']))
+    check_browsers(rss_cap_mb=0)
+    return watchdog_report()
+
+
+def watchdog_report():
+    with _lock:
+        report = dict(_stats)
+        report['browsers_running'] = len(_browsers)
+    report['reclaimed_mb'] = round(report['reclaimed_mb'], 1)
+    report['peak_rss_mb'] = round(report['peak_rss_mb'], 1)
+    return report
+
+
+def write_watchdog_report(path):
+    report = stop_watchdog()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[WATCHDOG] {report['browsers_started']} browsers started, "
+          f"{report['killed_over_cap']} killed over the memory cap, "
+          f"{report['orphans_reaped']} orphaned processes reaped, "
+          f"{report['reclaimed_mb']} MB reclaimed")
+    return report
@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+import time
+
+from config import DOMAIN_CACHE_ENABLED, DOMAIN_CACHE_PATH, DOMAIN_CACHE_TTL_DAYS
+
+# Append-only JSONL: the last line written for a domain wins. The file is
+# compacted when it is loaded, keeping only the latest fresh entry per domain,
+# so re-crawled and expired domains do not pile up run after run.
+_entries = None
+_lock = threading.Lock()
+
+
+def normalize_domain(domain):
+    domain = domain.strip().lower()
+    for prefix in ("https://", "http://"):
+        domain = domain.removeprefix(prefix)
+    return domain.removeprefix("www.").rstrip("/")
+
+
+def _load():
+    global _entries
+    if _entries is not None:
+        return _entries
+
+    _entries = {}
+    if os.path.exists(DOMAIN_CACHE_PATH):
+        lines = 0
+        with open(DOMAIN_CACHE_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                    _entries[entry['domain']] = entry
+                except (ValueError, KeyError):
+                    continue
+        oldest = time.time() - DOMAIN_CACHE_TTL_DAYS * 86400
+        _entries = {domain: entry for domain, entry in _entries.items()
+                    if entry['cached_at'] >= oldest}
+        if lines > len(_entries):
+            _rewrite(_entries)
+            print(f"[CACHE] Compacted {lines} lines to {len(_entries)}")
+        print(f"[CACHE] Loaded {len(_entries)} cached domains")
+    return _entries
+
+
+def _rewrite(entries):
+    # Written next to the cache and swapped in, so a crash keeps the old file
+    tmp_path = f"{DOMAIN_CACHE_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for entry in entries.values():
+            f.write(json.dumps(entry) + "\n")
+    os.replace(tmp_path, DOMAIN_CACHE_PATH)
+
+
+def is_cacheable(log):
+    # Partial results would hide the domain from the next run
+    return not log.get('timed_out') and not log.get('cache_hit')
+
+
+def get_cached_result(domain, ttl_days=DOMAIN_CACHE_TTL_DAYS):
+    if not DOMAIN_CACHE_ENABLED:
+        return None
+    with _lock:
+        entry = _load().get(normalize_domain(domain))
+    if entry is None:
+        return None
+
+    age_days = (time.time() - entry['cached_at']) / 86400
+    if age_days > ttl_days:
+        print(f"[CACHE] {domain} is stale ({age_days:.1f} days old)")
+        return None
+    return entry
+
+
+def put_cached_result(domain, log):
+    if not DOMAIN_CACHE_ENABLED or not is_cacheable(log):
+        return
+    entry = {
+        'domain': normalize_domain(domain),
+        'cached_at': time.time(),
+        'log': log,
+    }
+    with _lock:
+        _load()[entry['domain']] = entry
+        os.makedirs(os.path.dirname(DOMAIN_CACHE_PATH), exist_ok=True)
+        with open(DOMAIN_CACHE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
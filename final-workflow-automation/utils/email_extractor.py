@@ -0,0 +1,105 @@
+import re
+import unicodedata
+from urllib.parse import unquote
+
+# "@" or an obfuscated "[at]" / "(at)" / " at "; a plain " at " only counts
+# when the host is obfuscated too ("name at site dot com"), otherwise prose
+# like "visit us at www.site.com" would turn into an address
+_AT = r"(@|\s*[\[\(\{]\s*at\s*[\]\)\}]\s*|\s+at\s+)"
+# "." or an obfuscated "[dot]" / "(dot)" / " dot "
+_DOT = r"(?:\.|\s*[\[\(\{]\s*dot\s*[\]\)\}]\s*|\s+dot\s+)"
+
+# One scan finds plain and obfuscated addresses alike
+EMAIL_PATTERN = re.compile(
+    rf"(?<![\w.+-])([\w.+-]+){_AT}((?:[a-z0-9-]+{_DOT})+[a-z]{{2,}})\b",
+    re.IGNORECASE,
+)
+# Cheap scan for the "@" or "at" every address needs; the full pattern only
+# runs in a small window around each hit
+ANCHOR_PATTERN = re.compile(r"@|[\[\(\{]\s*at\s*[\]\)\}]|\sat\s", re.IGNORECASE)
+MAX_LOCAL_PART = 64
+MAX_DOMAIN = 255
+DOT_PATTERN = re.compile(_DOT, re.IGNORECASE)
+OBFUSCATED_DOT_PATTERN = re.compile(
+    r"[\[\(\{]\s*dot\s*[\]\)\}]|\sdot\s", re.IGNORECASE)
+VALID_EMAIL_PATTERN = re.compile(
+    r"[\w.+-]+@[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}", re.IGNORECASE)
+
+# Image names such as logo@2x.png look like addresses
+ASSET_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".svg",
+                  ".webp", ".css", ".js")
+
+CF_PROTECTION_PATH = "/cdn-cgi/l/email-protection#"
+
+
+def _clean(user, at, host):
+    if at.strip().lower() == "at" and not OBFUSCATED_DOT_PATTERN.search(host):
+        return None
+    user = user.strip(".").lower()
+    host = DOT_PATTERN.sub(".", host).lower()
+    if not user or host.endswith(ASSET_SUFFIXES):
+        return None
+    return f"{user}@{host}"
+
+
+def find_emails(text):
+    if not text:
+        return []
+    if not text.isascii():
+        # "josé@exämple.com" -> "jose@example.com": NFKD splits off the
+        # accents as combining marks, which are then dropped
+        text = "".join(ch for ch in unicodedata.normalize("NFKD", text)
+                       if not unicodedata.combining(ch))
+
+    found = {}
+    scanned = 0
+    for anchor in ANCHOR_PATTERN.finditer(text):
+        if anchor.start() < scanned:
+            continue
+        match = EMAIL_PATTERN.search(
+            text,
+            max(scanned, anchor.start() - MAX_LOCAL_PART),
+            anchor.end() + MAX_DOMAIN,
+        )
+        if match:
+            email = _clean(match.group(1), match.group(2), match.group(3))
+            if email:
+                found[email] = None
+            scanned = match.end()
+    return list(found)
+
+
+def decode_cfemail(encoded):
+    # Cloudflare XORs every byte with the first one
+    try:
+        key = int(encoded[:2], 16)
+        return "".join(
+            chr(int(encoded[i:i + 2], 16) ^ key)
+            for i in range(2, len(encoded), 2)
+        )
+    except ValueError:
+        return ""
+
+
+def extract_emails_from_dom(soup):
+    candidates = []
+
+    for link in soup.find_all("a", href=True):
+        href = link["href"].strip()
+        if href.lower().startswith("mailto:"):
+            addresses = unquote(href[7:]).split("?")[0]
+            candidates.extend(addresses.split(","))
+        elif CF_PROTECTION_PATH in href:
+            candidates.append(decode_cfemail(
+                href.split(CF_PROTECTION_PATH, 1)[1]))
+
+    for tag in soup.find_all(attrs={"data-cfemail": True}):
+        candidates.append(decode_cfemail(tag["data-cfemail"]))
+
+    found = {}
+    for candidate in candidates:
+        candidate = candidate.strip().lower()
+        if VALID_EMAIL_PATTERN.fullmatch(candidate) \
+                and not candidate.endswith(ASSET_SUFFIXES):
+            found[candidate] = None
+    return list(found)
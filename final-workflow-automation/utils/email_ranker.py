@@ -0,0 +1,128 @@
+import re
+from urllib.parse import urlparse
+
+# Local-part roles, best advertising contact first
+ROLE_SCORES = {
+    "ads": 5.0,
+    "adsales": 5.0,
+    "advertise": 5.0,
+    "advertising": 5.0,
+    "advertisers": 5.0,
+    "sponsor": 4.5,
+    "sponsors": 4.5,
+    "sponsorship": 4.5,
+    "sponsorships": 4.5,
+    "partnerships": 4.0,
+    "partners": 4.0,
+    "partner": 4.0,
+    "marketing": 4.0,
+    "media": 3.5,
+    "sales": 3.5,
+    "press": 3.0,
+    "pr": 3.0,
+    "business": 2.5,
+    "bd": 2.5,
+    "collab": 2.5,
+    "editor": 1.5,
+    "editorial": 1.5,
+    "hello": 1.0,
+    "contact": 1.0,
+    "team": 0.5,
+    "info": 0.5,
+    "office": 0.5,
+    "admin": -1.5,
+    "webmaster": -1.5,
+    "support": -1.0,
+    "help": -1.0,
+    "billing": -2.0,
+    "privacy": -2.0,
+    "legal": -2.0,
+    "dmca": -3.0,
+    "abuse": -3.0,
+    "jobs": -3.0,
+    "careers": -3.0,
+    "hr": -3.0,
+    "noreply": -5.0,
+    "donotreply": -5.0,
+}
+SAME_DOMAIN_SCORE = 3.0
+FREE_MAIL_SCORE = -0.5
+OTHER_DOMAIN_SCORE = -1.0
+JUNK_DOMAIN_SCORE = -5.0
+KEYWORD_SCORE = 1.0
+MAX_KEYWORD_SCORE = 3.0
+CONTEXT_CHARS = 200
+
+FREE_MAIL_DOMAINS = {"gmail.com", "yahoo.com", "outlook.com", "hotmail.com",
+                     "icloud.com", "aol.com", "proton.me", "protonmail.com"}
+# Addresses that come from tracking scripts, site builders and docs
+JUNK_DOMAINS = {"sentry.io", "wixpress.com", "example.com", "domain.com",
+                "email.com", "yourdomain.com", "sentry-next.wixpress.com"}
+
+# Word starts, so "WordPress", "express" or "impressive" are no press cue
+KEYWORD_PATTERN = re.compile(
+    r"\b(?:advertis|sponsor|media kit|mediakit|rate card|partnership|marketing|"
+    r"press\b|brand|campaign|collaborat)")
+LOCAL_PART_SPLIT = re.compile(r"[._+-]+")
+
+
+def _site_host(domain_url):
+    host = urlparse(domain_url if "//" in domain_url else f"//{domain_url}").hostname or ""
+    return host.lower().removeprefix("www.")
+
+
+def role_score(local_part):
+    local_part = local_part.replace("no-reply", "noreply").replace(
+        "do-not-reply", "donotreply")
+    scores = [ROLE_SCORES[token]
+              for token in LOCAL_PART_SPLIT.split(local_part) if token in ROLE_SCORES]
+    if not scores:
+        # Joined roles such as "salesuk" or "adsteam"; a short role ("ads",
+        # "pr") only counts when the rest is a role too, so "adam" is no ad
+        scores = [score for role, score in ROLE_SCORES.items()
+                  if local_part.startswith(role)
+                  and (len(role) >= 4 or local_part[len(role):] in ROLE_SCORES)]
+    if not scores:
+        return 0.0
+    # Negative roles win over positive ones ("noreply-sales")
+    return min(scores) if min(scores) < 0 else max(scores)
+
+
+def domain_score(email_domain, site_host):
+    if email_domain in JUNK_DOMAINS or email_domain.endswith(".wixpress.com"):
+        return JUNK_DOMAIN_SCORE
+    if site_host and (email_domain == site_host
+                      or email_domain.endswith("." + site_host)
+                      or site_host.endswith("." + email_domain)):
+        return SAME_DOMAIN_SCORE
+    if email_domain in FREE_MAIL_DOMAINS:
+        return FREE_MAIL_SCORE
+    return OTHER_DOMAIN_SCORE
+
+
+def keyword_score(email, text):
+    if not text:
+        return 0.0
+    hits = 0
+    start = text.find(email)
+    while start != -1 and hits * KEYWORD_SCORE < MAX_KEYWORD_SCORE:
+        window = text[max(0, start - CONTEXT_CHARS):start + len(email) + CONTEXT_CHARS]
+        hits += len(KEYWORD_PATTERN.findall(window))
+        start = text.find(email, start + len(email))
+    return min(hits * KEYWORD_SCORE, MAX_KEYWORD_SCORE)
+
+
+def score_email(email, site_host, text=""):
+    local_part, _, email_domain = email.lower().partition("@")
+    return round(role_score(local_part)
+                 + domain_score(email_domain, site_host)
+                 + keyword_score(email.lower(), text), 2)
+
+
+def rank_emails(emails, domain_url, text=""):
+    site_host = _site_host(domain_url)
+    text = text.lower()
+    scores = {email: score_email(email, site_host, text) for email in emails}
+    # sorted() is stable, so ties keep page order
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return ranked, scores
@@ -0,0 +1,127 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+
+
+class StackSampler:
+    # Samples one thread's Python stack at a fixed interval and counts the
+    # collapsed stacks ("outer;inner;leaf count"), the input format of
+    # flamegraph.pl and speedscope.
+
+    def __init__(self, thread_id, interval_s):
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def start_profile(name, interval_s=0.01):
+    # Profiles the calling thread until finish_profile()
+    session = {
+        'name': name,
+        'profiler': cProfile.Profile(),
+        'sampler': StackSampler(threading.get_ident(), interval_s),
+        'started_at': time.time(),
+        'lock': threading.Lock(),
+        'finished': False,
+        'info': None,
+    }
+    session['sampler'].start()
+    session['profiler'].enable()
+    return session
+
+
+def finish_profile(session, output_dir, threshold_s=0.0, status="ok"):
+    # Only the first call writes the files, so a domain that timed out is
+    # dumped by crawl_domain and the abandoned thread's later call is a no-op.
+    # Profiles of failed or timed-out calls are always kept.
+    with session['lock']:
+        if session['finished']:
+            return session['info']
+        session['finished'] = True
+
+    profiler, sampler = session['profiler'], session['sampler']
+    profiler.disable()
+    sampler.stop()
+    name = session['name']
+    elapsed = time.time() - session['started_at']
+
+    if status == "ok" and elapsed < threshold_s:
+        print(f"[PROFILE] {name} took {elapsed:.1f}s, under {threshold_s}s; discarded")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, name)
+    profiler.dump_stats(f"{base}.prof")
+    sampler.write_collapsed(f"{base}.folded")
+
+    stats = pstats.Stats(profiler)
+    stats.sort_stats("cumulative")
+    top = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in \
+            sorted(stats.stats.items(), key=lambda item: -item[1][3])[:15]:
+        top.append({
+            'function': f"{function} ({os.path.basename(filename)}:{line})",
+            'calls': calls,
+            'self_s': round(tottime, 3),
+            'cumulative_s': round(cumtime, 3),
+        })
+
+    print(f"[PROFILE] {name} {status} after {elapsed:.1f}s; wrote {base}.prof and {base}.folded")
+    session['info'] = {
+        'status': status,
+        'elapsed_s': round(elapsed, 3),
+        'prof_path': f"{base}.prof",
+        'collapsed_path': f"{base}.folded",
+        'samples': sum(sampler.counts.values()),
+        'top_cumulative': top,
+    }
+    return session['info']
+
+
+def profile_call(func, name, output_dir, threshold_s=0.0, interval_s=0.01, sessions=None):
+    # Runs func() under cProfile and the stack sampler. Files are only kept
+    # when the call took at least threshold_s seconds or did not finish.
+    # The session is appended to `sessions` so a caller that gives up on
+    # func() can still dump it with finish_profile().
+    session = start_profile(name, interval_s)
+    if sessions is not None:
+        sessions.append(session)
+    status = "failed"
+    try:
+        result = func()
+        status = "ok"
+    finally:
+        info = finish_profile(session, output_dir, threshold_s, status)
+    return result, info
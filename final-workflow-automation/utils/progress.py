@@ -0,0 +1,82 @@
+import json
+import os
+import time
+
+from gpt.ledger import get_run_cost
+
+
+def new_progress(total):
+    return {
+        'total': total,
+        'done': 0,
+        'timed_out': 0,
+        'cache_hits': 0,
+        'failed': 0,
+        'started_at': time.time(),
+    }
+
+
+def update_progress(progress, log=None):
+    # log=None marks a domain that failed without producing a log
+    progress['done'] += 1
+    if log is None:
+        progress['failed'] += 1
+        return progress
+    if log.get('timed_out'):
+        progress['timed_out'] += 1
+    if log.get('cache_hit'):
+        progress['cache_hits'] += 1
+    return progress
+
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes}m{seconds:02d}s"
+
+
+def progress_snapshot(progress):
+    elapsed = time.time() - progress['started_at']
+    done = progress['done']
+    remaining = progress['total'] - done
+    rate = done / elapsed * 60 if elapsed > 0 else 0.0
+    eta = remaining / rate * 60 if rate else None
+    return {
+        'done': done,
+        'total': progress['total'],
+        'elapsed_s': round(elapsed, 1),
+        'domains_per_min': round(rate, 2),
+        'eta_s': round(eta, 1) if eta is not None else None,
+        'timeout_rate': round(progress['timed_out'] / done, 3) if done else 0.0,
+        'cache_hits': progress['cache_hits'],
+        'failed': progress['failed'],
+        'gpt_spend_usd': round(get_run_cost(), 5),
+    }
+
+
+def format_progress(snapshot):
+    eta = _format_duration(snapshot['eta_s']) if snapshot['eta_s'] is not None else "--"
+    return (
+        f"[PROGRESS] {snapshot['done']}/{snapshot['total']} domains"
+        f" | {snapshot['domains_per_min']:.2f}/min"
+        f" | ETA {eta}"
+        f" | timeouts {snapshot['timeout_rate']:.0%}"
+        f" | cache hits {snapshot['cache_hits']}"
+        f" | failed {snapshot['failed']}"
+        f" | GPT ${snapshot['gpt_spend_usd']:.4f}"
+    )
+
+
+def report_progress(progress, path=None):
+    snapshot = progress_snapshot(progress)
+    print(format_progress(snapshot))
+    if path:
+        # Rewritten after every domain so the run can be watched from outside
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_path, path)
+    return snapshot
@@ -1,43 +1,43 @@
-import os
-import json
 import csv
 from pathlib import Path
-from config import LOGS_DIR_PATH, OUTPUT_CSV_PATH
+from config import OUTPUT_CSV_PATH, RESULTS_DB_PATH
+from utils.results_store import iter_results, submitted_form_url
 
+SUMMARY_FIELDS = ["Domain", "Email(s)", "Form"]
 
-def generate_summary_csv():
-    LOGS_DIR = Path(LOGS_DIR_PATH)
-    OUTPUT_PATH = Path(OUTPUT_CSV_PATH)
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-    rows = []
-
-    for file in LOGS_DIR.glob("*.json"):
-        try:
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
 
-            domain = data.get("domain", "")
-            emails = data.get("email_extraction", {}).get("emails_found", [])
-            email_str = ", ".join(emails)
-
-            form_info = data.get("form_submission", {})
-            form_url = form_info.get("url") if form_info.get(
-                "submit_clicked") else ""
+def generate_summary_csv(results_path=RESULTS_DB_PATH, output_path=OUTPUT_CSV_PATH):
+    OUTPUT_PATH = Path(output_path)
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-            rows.append({
-                "Domain": domain,
-                "Email(s)": email_str,
-                "Form": form_url
+    count = 0
+    with open(OUTPUT_PATH, "w", newline='', encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        # Rows are streamed from the results store, one domain at a time
+        for result in iter_results(results_path):
+            writer.writerow({
+                "Domain": result['domain'],
+                "Email(s)": result['emails'],
+                "Form": result['form_url']
             })
+            count += 1
+
+    print(f"\n✅ Final CSV summary ({count} domains) written to: {OUTPUT_PATH}")
 
-        except Exception as e:
-            print(f"[ERROR] Failed to parse {file.name}: {e}")
 
+def start_summary_csv(output_path=OUTPUT_CSV_PATH):
+    OUTPUT_PATH = Path(output_path)
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(OUTPUT_PATH, "w", newline='', encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=[
-                                "Domain", "Email(s)", "Form"])
-        writer.writeheader()
-        writer.writerows(rows)
+        csv.DictWriter(csvfile, fieldnames=SUMMARY_FIELDS).writeheader()
+
 
-    print(f"\n✅ Final CSV summary written to: {OUTPUT_PATH}")
+def append_summary_row(domain, log, output_path=OUTPUT_CSV_PATH):
+    # One row per finished domain, so an interrupted run still has a summary
+    with open(output_path, "a", newline='', encoding="utf-8") as csvfile:
+        csv.DictWriter(csvfile, fieldnames=SUMMARY_FIELDS).writerow({
+            "Domain": domain,
+            "Email(s)": ", ".join(log.get("email_extraction", {}).get("emails_found", [])),
+            "Form": submitted_form_url(log)
+        })
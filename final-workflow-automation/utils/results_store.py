@@ -0,0 +1,109 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import RESULTS_DB_PATH
+
+# One row per finished domain, appended as soon as the domain is done.
+# WAL mode lets reports read the file while a run is still writing to it.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    domain TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    timed_out INTEGER NOT NULL,
+    cache_hit INTEGER NOT NULL,
+    emails TEXT NOT NULL,
+    form_url TEXT NOT NULL,
+    cost_usd REAL NOT NULL,
+    log TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_domain ON results (domain);
+"""
+
+_connections = {}
+_lock = threading.Lock()
+
+
+def _connect(path):
+    path = str(path)
+    if path not in _connections:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        _connections[path] = connection
+    return _connections[path]
+
+
+def _connect_read_only(path):
+    return sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+
+
+def submitted_form_url(log):
+    form_info = log.get('form_submission', {})
+    if not form_info.get('submit_clicked'):
+        return ""
+    return form_info.get('url') or ""
+
+
+def append_result(domain, log, path=RESULTS_DB_PATH):
+    row = (
+        domain,
+        time.time(),
+        int(bool(log.get('timed_out'))),
+        int(bool(log.get('cache_hit'))),
+        ", ".join(log.get('email_extraction', {}).get('emails_found', [])),
+        submitted_form_url(log),
+        log.get('token_usage', {}).get('estimated_cost_usd', 0.0),
+        json.dumps(log),
+    )
+    with _lock:
+        connection = _connect(path)
+        connection.execute(
+            "INSERT INTO results (domain, finished_at, timed_out, cache_hit, "
+            "emails, form_url, cost_usd, log) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            row)
+        connection.commit()
+
+
+def iter_results(path=RESULTS_DB_PATH, with_log=False):
+    # Streams rows in finishing order; safe to call during a run
+    if not os.path.exists(path):
+        return
+    columns = "domain, finished_at, timed_out, cache_hit, emails, form_url, cost_usd"
+    if with_log:
+        columns += ", log"
+    connection = _connect_read_only(path)
+    connection.row_factory = sqlite3.Row
+    try:
+        for row in connection.execute(f"SELECT {columns} FROM results ORDER BY id"):
+            result = dict(row)
+            if with_log:
+                result['log'] = json.loads(result['log'])
+            yield result
+    finally:
+        connection.close()
+
+
+def get_result(domain, path=RESULTS_DB_PATH):
+    if not os.path.exists(path):
+        return None
+    connection = _connect_read_only(path)
+    try:
+        row = connection.execute(
+            "SELECT log FROM results WHERE domain = ? ORDER BY id DESC LIMIT 1",
+            (domain,)).fetchone()
+    finally:
+        connection.close()
+    return json.loads(row[0]) if row else None
+
+
+def close_results_store():
+    with _lock:
+        for connection in _connections.values():
+            connection.close()
+        _connections.clear()
@@ -0,0 +1,111 @@
+import hashlib
+import re
+import threading
+
+# Tags whose text never reaches the page text
+NON_CONTENT_TAGS = ["script", "style", "noscript",
+                    "svg", "template", "iframe", "canvas"]
+# Layout blocks that repeat on every page of a site
+BOILERPLATE_TAGS = ["nav", "header", "footer", "aside"]
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary"}
+COOKIE_PATTERN = re.compile(r"cookie|consent|gdpr|onetrust", re.I)
+# A banner is a small block; anything bigger, or holding page content, is a
+# wrapper that merely mentions cookies (class="has-cookie-consent")
+COOKIE_BANNER_MAX_CHARS = 1500
+COOKIE_BANNER_KEEP_TAGS = ["main", "article", "form"]
+MAILTO_PATTERN = re.compile(r"^\s*mailto:", re.I)
+
+SPACES_PATTERN = re.compile(r"[ \t\r\f\v\u00a0\u200b]+")
+
+_lock = threading.Lock()
+
+
+def new_compaction_state():
+    return {
+        'seen_blocks': set(),
+        'pages': 0,
+        'raw_chars': 0,
+        'compact_chars': 0,
+        'blocks_dropped': 0,
+    }
+
+
+def _fingerprint(text):
+    text = SPACES_PATTERN.sub(" ", text).strip().lower()
+    if len(text) < 20:
+        return None
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def _is_cookie_banner(tag):
+    attrs = " ".join([tag.get("id") or ""] + list(tag.get("class") or []))
+    if not COOKIE_PATTERN.search(attrs):
+        return False
+    if tag.find(COOKIE_BANNER_KEEP_TAGS) or tag.find("a", href=MAILTO_PATTERN):
+        return False
+    return len(tag.get_text(" ", strip=True)) <= COOKIE_BANNER_MAX_CHARS
+
+
+def collapse_whitespace(text):
+    lines = []
+    previous = None
+    for line in text.split("\n"):
+        line = SPACES_PATTERN.sub(" ", line).strip()
+        if not line or line == previous:
+            continue
+        lines.append(line)
+        previous = line
+    return "\n".join(lines)
+
+
+def compact_soup_text(soup, state=None):
+    raw_chars = len(soup.get_text(separator="\n"))
+    dropped = 0
+
+    for tag in soup.find_all(NON_CONTENT_TAGS):
+        tag.decompose()
+
+    for tag in soup.find_all(["div", "section", "aside"]):
+        if not tag.decomposed and _is_cookie_banner(tag):
+            tag.decompose()
+            dropped += 1
+
+    if state is not None:
+        blocks = soup.find_all(BOILERPLATE_TAGS) + [
+            tag for tag in soup.find_all(attrs={"role": True})
+            if tag.get("role") in BOILERPLATE_ROLES
+        ]
+        for tag in blocks:
+            if tag.decomposed:
+                continue
+            fingerprint = _fingerprint(tag.get_text(" "))
+            if fingerprint is None:
+                continue
+            with _lock:
+                seen = fingerprint in state['seen_blocks']
+                state['seen_blocks'].add(fingerprint)
+            if seen:
+                tag.decompose()
+                dropped += 1
+
+    text = collapse_whitespace(soup.get_text(separator="\n"))
+
+    if state is not None:
+        with _lock:
+            state['pages'] += 1
+            state['raw_chars'] += raw_chars
+            state['compact_chars'] += len(text)
+            state['blocks_dropped'] += dropped
+
+    return text
+
+
+def compaction_summary(state):
+    raw = state['raw_chars']
+    return {
+        'pages': state['pages'],
+        'raw_chars': raw,
+        'compact_chars': state['compact_chars'],
+        'blocks_dropped': state['blocks_dropped'],
+        'reduction': round(1 - state['compact_chars'] / raw, 3) if raw else 0.0,
+    }
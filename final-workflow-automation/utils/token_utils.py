@@ -0,0 +1,127 @@
+import math
+import re
+
+from config import GPT_MODEL
+
+# Rough fallback used only when no tokenizer can be loaded
+CHARS_PER_TOKEN = 4
+
+_encoders = {}
+
+
+def get_encoder(model=GPT_MODEL):
+    if model in _encoders:
+        return _encoders[model]
+
+    encoder = None
+    try:
+        # Imported here: loading tiktoken is only worth it once text is counted
+        import tiktoken
+    except ImportError:
+        tiktoken = None
+    if tiktoken is not None:
+        try:
+            try:
+                encoder = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoder = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            print(
+                f"[WARN] Tokenizer unavailable for {model}, estimating from characters: {e}")
+
+    _encoders[model] = encoder
+    return encoder
+
+
+def count_tokens(text, model=GPT_MODEL):
+    if not text:
+        return 0
+    encoder = get_encoder(model)
+    if encoder is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text, max_tokens, model=GPT_MODEL):
+    if not text or max_tokens <= 0:
+        return ""
+    encoder = get_encoder(model)
+    if encoder is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens])
+
+
+def allocate_token_budget(token_counts, budget):
+    # Water-filling: small texts keep everything, the leftover budget is
+    # shared evenly between the larger ones.
+    allocation = {}
+    remaining = dict(token_counts)
+    left = max(budget, 0)
+
+    while remaining:
+        share = left // len(remaining)
+        fitting = {k: v for k, v in remaining.items() if v <= share}
+        if not fitting:
+            for key in remaining:
+                allocation[key] = share
+            break
+        for key, count in fitting.items():
+            allocation[key] = count
+            left -= count
+            del remaining[key]
+
+    return allocation
+
+
+def pack_texts(texts, budget, model=GPT_MODEL):
+    token_counts = {key: count_tokens(text, model)
+                    for key, text in texts.items()}
+    allocation = allocate_token_budget(token_counts, budget)
+
+    packed = {}
+    overflowed = []
+    for key, text in texts.items():
+        if token_counts[key] > allocation[key]:
+            overflowed.append(key)
+            packed[key] = truncate_to_tokens(text, allocation[key], model)
+        else:
+            packed[key] = text
+
+    return packed, overflowed
+
+
+def split_into_chunks(text, max_tokens, model=GPT_MODEL):
+    # Split on blank lines first, then single lines, so chunks end on
+    # natural boundaries. Pieces longer than a chunk are cut by tokens.
+    pieces = []
+    for block in re.split(r"\n\s*\n", text):
+        if count_tokens(block, model) <= max_tokens:
+            pieces.append(block)
+            continue
+        for line in block.split("\n"):
+            while count_tokens(line, model) > max_tokens:
+                head = truncate_to_tokens(line, max_tokens, model)
+                if not head:
+                    break
+                pieces.append(head)
+                line = line[len(head):]
+            pieces.append(line)
+
+    chunks = []
+    current, current_tokens = [], 0
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        tokens = count_tokens(piece, model) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,84 @@
+import contextlib
+import json
+import math
+import threading
+import time
+
+_lock = threading.Lock()
+
+
+def new_timings():
+    return {
+        'started_at': time.time(),
+        'spans': [],
+        'totals': {},
+    }
+
+
+def record_span(log, name, duration_s, start_s=None):
+    with _lock:
+        timings = log.setdefault('timings', new_timings())
+        if start_s is None:
+            start_s = time.time() - duration_s
+        timings['spans'].append({
+            'name': name,
+            'start_s': round(start_s - timings['started_at'], 3),
+            'duration_s': round(duration_s, 3),
+        })
+        timings['totals'][name] = round(
+            timings['totals'].get(name, 0.0) + duration_s, 3)
+
+
+@contextlib.contextmanager
+def span(log, name):
+    # Records the block's wall time under log['timings'], even if it raises
+    start = time.time()
+    try:
+        yield
+    finally:
+        record_span(log, name, time.time() - start, start)
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile of an unsorted list
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def timing_report(logs):
+    # Per stage: how many domains hit it and the p50/p95/max of the time
+    # each domain spent in it
+    per_stage = {}
+    for log in logs:
+        for name, total in log.get('timings', {}).get('totals', {}).items():
+            per_stage.setdefault(name, []).append(total)
+
+    report = {}
+    for name, values in sorted(per_stage.items()):
+        report[name] = {
+            'domains': len(values),
+            'p50_s': round(percentile(values, 50), 3),
+            'p95_s': round(percentile(values, 95), 3),
+            'max_s': round(max(values), 3),
+            'total_s': round(sum(values), 3),
+        }
+    return report
+
+
+def format_timing_report(report):
+    lines = [f"{'stage':<28} {'domains':>7} {'p50 s':>8} {'p95 s':>8} {'max s':>8} {'total s':>9}"]
+    for name, row in sorted(report.items(), key=lambda item: -item[1]['total_s']):
+        lines.append(
+            f"{name:<28} {row['domains']:>7} {row['p50_s']:>8.2f} "
+            f"{row['p95_s']:>8.2f} {row['max_s']:>8.2f} {row['total_s']:>9.1f}")
+    return "\n".join(lines)
+
+
+def write_timing_report(logs, path):
+    report = timing_report(logs)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[TIMINGS] Per-stage report written to {path}")
+    print(format_timing_report(report))
+    return report
@@ -1,12 +1,15 @@
 import os
 import json
-import re
 import time
 import pandas as pd
 from dotenv import load_dotenv
 from openai import OpenAI
 from pathlib import Path
 import concurrent.futures
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from structured_output import CONTACT_METHOD_SCHEMA, parse_structured, responses_text_format
 
 # Load environment variables
 load_dotenv()
@@ -67,7 +70,8 @@ def process_domain(domain, expected_email, expected_form):
             model="gpt-4.1",
             input=input_prompt,
             tools=[{"type": "web_search_preview"}],
-            tool_choice={"type": "web_search_preview"}
+            tool_choice={"type": "web_search_preview"},
+            text=responses_text_format("contact_method", CONTACT_METHOD_SCHEMA)
         )
 
         output_text = response.output_text.strip()
@@ -85,15 +89,7 @@ def process_domain(domain, expected_email, expected_form):
             "estimated_cost_usd": round(estimated_cost, 5)
         }
 
-        try:
-            result = json.loads(output_text)
-        except json.JSONDecodeError:
-            match = re.search(
-                r'{"type":\s*"(email|form|none)",\s*"value":\s*"([^"]+)"}', output_text)
-            if match:
-                result = {"type": match.group(1), "value": match.group(2)}
-            else:
-                raise ValueError("Could not parse GPT response.")
+        result = parse_structured(output_text, CONTACT_METHOD_SCHEMA)
 
         if result["type"] == "email":
             log_data["emails"].append(result["value"])
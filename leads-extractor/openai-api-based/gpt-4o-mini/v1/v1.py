@@ -1,12 +1,15 @@
 import os
 import json
-import re
 import time
 import pandas as pd
 from dotenv import load_dotenv
 from openai import OpenAI
 from pathlib import Path
 import concurrent.futures
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from structured_output import BEST_CONTACTS_SCHEMA, chat_response_format, parse_structured
 
 # Load environment variables
 load_dotenv()
@@ -87,6 +90,7 @@ def process_domain(domain, expected_email, expected_form):
         response = client.chat.completions.create(
             model="gpt-4o-mini-search-preview",
             web_search_options={},
+            response_format=chat_response_format("best_contacts", BEST_CONTACTS_SCHEMA),
             messages=[
                 {
                     "role": "user",
@@ -97,15 +101,7 @@ def process_domain(domain, expected_email, expected_form):
 
         output_text = response.choices[0].message.content.strip()
 
-        try:
-            result = json.loads(output_text)
-        except json.JSONDecodeError:
-            match = re.search(
-                r'{"type":\s*"(email|form|none)",\s*"value":\s*"([^"]+)"}', output_text)
-            if match:
-                result = {"type": match.group(1), "value": match.group(2)}
-            else:
-                raise ValueError("Could not parse GPT response.")
+        result = parse_structured(output_text, BEST_CONTACTS_SCHEMA)
 
         best_email = result.get("best_email", "").strip()
         best_form = result.get("best_form", "").strip()
@@ -1,12 +1,15 @@
 import os
 import json
-import re
 import time
 import pandas as pd
 from dotenv import load_dotenv
 from openai import OpenAI
 from pathlib import Path
 import concurrent.futures
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from structured_output import CONTACT_METHOD_SCHEMA, FORM_FIELDS_SCHEMA, chat_response_format, parse_structured
 
 # Load environment variables
 load_dotenv()
@@ -46,9 +49,9 @@ def extract_form_fields_from_url(form_url):
     - label (either direct label tag or inferred from nearby/parent text)
     - placeholder (if present)
     - required (true/false)
-    - input type (text, email, checkbox, etc)
+    - input_type (text, email, checkbox, etc)
     - tag (input, select, textarea, etc)
-    - any descriptive text nearby
+    - nearby_text (any descriptive text nearby)
 
     Return only the final result in JSON format:
     {{
@@ -61,6 +64,7 @@ def extract_form_fields_from_url(form_url):
         response = client.chat.completions.create(
             model="gpt-4o-search-preview",
             web_search_options={},
+            response_format=chat_response_format("form_fields", FORM_FIELDS_SCHEMA),
             messages=[
                 {"role": "user", "content": prompt}
             ]
@@ -68,13 +72,7 @@ def extract_form_fields_from_url(form_url):
         output = response.choices[0].message.content.strip()
         print(f"[DEBUG] GPT form field response:\n{output}\n")
 
-        try:
-            parsed = json.loads(output)
-            return parsed
-        except json.JSONDecodeError:
-            match = re.search(r'\{.*\}', output, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
+        return parse_structured(output, FORM_FIELDS_SCHEMA)
 
     except Exception as e:
         print(f"[ERROR] Failed to extract form fields: {e}")
@@ -135,6 +133,7 @@ def process_domain(domain, expected_email, expected_form):
         response = client.chat.completions.create(
             model="gpt-4o-search-preview",
             web_search_options={},
+            response_format=chat_response_format("contact_method", CONTACT_METHOD_SCHEMA),
             messages=[
                 {"role": "user", "content": input_prompt}
             ]
@@ -153,15 +152,7 @@ def process_domain(domain, expected_email, expected_form):
             "estimated_cost_usd": round(estimated_cost, 5)
         }
 
-        try:
-            result = json.loads(output_text)
-        except json.JSONDecodeError:
-            match = re.search(
-                r'{"type":\s*"(email|form|none)",\s*"value":\s*"([^"]+)"}', output_text)
-            if match:
-                result = {"type": match.group(1), "value": match.group(2)}
-            else:
-                raise ValueError("Could not parse GPT response.")
+        result = parse_structured(output_text, CONTACT_METHOD_SCHEMA)
 
         print(f"[INFO] Contact method detected: {result}")
 
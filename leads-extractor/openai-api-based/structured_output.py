@@ -0,0 +1,72 @@
+import json
+import sys
+from pathlib import Path
+
+# One validator for both projects: reuse the one in final-workflow-automation
+sys.path.append(str(Path(__file__).resolve().parents[2] / "final-workflow-automation"))
+from gpt.schemas import validate  # noqa: E402
+
+# === Schemas for the web-search scripts ===
+CONTACT_METHOD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "type": {"type": "string", "enum": ["email", "form", "none"]},
+        "value": {"type": "string"},
+    },
+    "required": ["type", "value"],
+    "additionalProperties": False,
+}
+
+BEST_CONTACTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "best_email": {"type": "string"},
+        "best_form": {"type": "string"},
+    },
+    "required": ["best_email", "best_form"],
+    "additionalProperties": False,
+}
+
+FORM_FIELD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        "name": {"type": "string"},
+        "label": {"type": "string"},
+        "placeholder": {"type": "string"},
+        "required": {"type": "boolean"},
+        "input_type": {"type": "string"},
+        "tag": {"type": "string"},
+        "nearby_text": {"type": "string"},
+    },
+    "required": ["id", "name", "label", "placeholder", "required", "input_type", "tag", "nearby_text"],
+    "additionalProperties": False,
+}
+
+FORM_FIELDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "form_url": {"type": "string"},
+        "fields": {"type": "array", "items": FORM_FIELD_SCHEMA},
+    },
+    "required": ["form_url", "fields"],
+    "additionalProperties": False,
+}
+
+def chat_response_format(name, schema):
+    # For client.chat.completions.create(response_format=...)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": True},
+    }
+
+
+def responses_text_format(name, schema):
+    # For client.responses.create(text=...)
+    return {
+        "format": {"type": "json_schema", "name": name, "schema": schema, "strict": True}
+    }
+
+
+def parse_structured(text, schema):
+    return validate(json.loads(text), schema)